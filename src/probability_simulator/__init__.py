@@ -1,3 +1,90 @@
-from probability_simulator.coin_flips import Coin, CoinExperiment
+"""Probability experiments and simulations.
 
-__all__ = ["Coin", "CoinExperiment"]
+Submodules are imported lazily on first attribute access, so importing
+the package (or only `probability_simulator.validation`) does not pull
+in NumPy.
+"""
+
+from importlib import import_module
+
+# set without importing typing, which costs more than the rest of the
+# package; type checkers treat any TYPE_CHECKING constant as True
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from probability_simulator.coin_flips import (
+        Coin,
+        CoinExperiment,
+        columns,
+        trial_schema,
+    )
+    from probability_simulator.games import (
+        GameResult,
+        MultiCoinExperiment,
+        Tournament,
+        penney_tournament,
+    )
+    from probability_simulator.random_walks import (
+        MarkovCoin,
+        RandomWalk,
+        WalkResult,
+    )
+
+# public name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    "Coin": "coin_flips",
+    "CoinExperiment": "coin_flips",
+    "columns": "coin_flips",
+    "trial_schema": "coin_flips",
+    "GameResult": "games",
+    "MultiCoinExperiment": "games",
+    "Tournament": "games",
+    "penney_tournament": "games",
+    "MarkovCoin": "random_walks",
+    "RandomWalk": "random_walks",
+    "WalkResult": "random_walks",
+}
+
+# submodules, imported on first access as attributes of the package
+_SUBMODULES = {
+    "cli",
+    "coin_flips",
+    "diagnostics",
+    "distributed",
+    "engines",
+    "games",
+    "random_walks",
+    "rng",
+    "stats",
+    "validation",
+}
+
+__all__ = [
+    "Coin",
+    "CoinExperiment",
+    "GameResult",
+    "MarkovCoin",
+    "MultiCoinExperiment",
+    "RandomWalk",
+    "Tournament",
+    "WalkResult",
+    "columns",
+    "penney_tournament",
+    "trial_schema",
+]
+
+
+def __getattr__(name: str):
+    """Import the submodule that is, or defines, name on first access"""
+    if name in _SUBMODULES:
+        # importing a submodule also sets it as an attribute of the package
+        return import_module(f"{__name__}.{name}")
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = import_module(f"{__name__}.{_LAZY_ATTRIBUTES[name]}")
+    value = getattr(module, name)
+    globals()[name] = value  # cache so __getattr__ isn't called again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
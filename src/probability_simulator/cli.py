@@ -0,0 +1,272 @@
+"""cli.py : Command-line batch runner for coin experiments
+
+    probability-simulator experiment.toml --summary summary.json \\
+        --results results.npy
+
+The experiment spec is a TOML or JSON file, for example:
+
+    bias = 0.3
+    trial = "flips_until_heads"
+    ntrials = 10000000
+    seed = 42
+    chunk_size = 1000000
+    precision = 0.001   # stop early once the standard error is this small
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+import tomllib
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from probability_simulator.coin_flips import Coin
+from probability_simulator.engines import SAMPLERS
+from probability_simulator.rng import BIT_GENERATORS, make_rng
+from probability_simulator.stats import RunningStats
+from probability_simulator.validation import (
+    Field,
+    RealNumber,
+    RealNumberWithinInterval,
+)
+
+
+class ExperimentSpec:
+    """Settings of a batch experiment.
+
+    bias: probability of heads
+    trial: name of the trial type, one of engines.SAMPLERS
+    ntrials: (maximum) number of trials
+    seed: root seed, default fresh entropy (recorded in the summary)
+    workers: number of worker processes; more than 1 runs seeded shards
+        of chunk_size trials with the distributed coordinator
+    chunk_size: number of trials simulated per vectorized chunk
+    precision: optional target standard error of the mean; the run stops
+        after the first chunk that reaches it (single worker only)
+    rng: name of the bit generator, one of rng.BIT_GENERATORS
+    trial_options: keyword arguments for the trial's sampler
+    """
+
+    bias = RealNumberWithinInterval(interval="[0,1]", auto_convert=True)
+    trial = Field(expected_type=str)
+    ntrials = Field(expected_type=int)
+    seed = Field(expected_type=int, allow_none=True)
+    workers = Field(expected_type=int)
+    chunk_size = Field(expected_type=int)
+    precision = RealNumber(allow_none=True, auto_convert=False)
+    rng = Field(expected_type=str)
+    trial_options = Field(expected_type=dict)
+
+    def __init__(
+        self,
+        bias=0.5,
+        trial: str = "flips_until_heads",
+        ntrials: int = 1000000,
+        seed: int | None = None,
+        workers: int = 1,
+        chunk_size: int = 100000,
+        precision: float | None = None,
+        rng: str = "pcg64",
+        trial_options: dict | None = None,
+    ):
+        self.bias = bias
+        self.trial = trial
+        self.ntrials = ntrials
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.precision = precision
+        self.rng = rng
+        self.trial_options = {} if trial_options is None else trial_options
+
+        if trial not in SAMPLERS:
+            raise ValueError(
+                f"Unknown trial type {trial!r}, choose one of "
+                f"{sorted(SAMPLERS)}"
+            )
+        if rng not in BIT_GENERATORS:
+            raise ValueError(
+                f"Unknown rng {rng!r}, choose one of {sorted(BIT_GENERATORS)}"
+            )
+        for name in ("ntrials", "workers", "chunk_size"):
+            if getattr(self, name) < 1:
+                raise ValueError(
+                    f"{name} must be a positive integer, "
+                    f"got {getattr(self, name)}"
+                )
+        if precision is not None and precision <= 0:
+            raise ValueError(f"precision must be positive, got {precision}")
+        if precision is not None and workers > 1:
+            # which shards finish first depends on scheduling, so stopping
+            # early would make the results depend on it too
+            raise ValueError(
+                "precision can only be used with a single worker, "
+                f"got workers={workers}"
+            )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "ExperimentSpec":
+        """Read a spec from a .toml or .json file"""
+        path = Path(path)
+        if path.suffix == ".toml":
+            with path.open("rb") as file:
+                settings = tomllib.load(file)
+        elif path.suffix == ".json":
+            with path.open() as file:
+                settings = json.load(file)
+        else:
+            raise ValueError(
+                f"Experiment spec must be a .toml or .json file, got {path}"
+            )
+        return cls.from_dict(settings)
+
+    @classmethod
+    def from_dict(cls, settings: dict[str, Any]) -> "ExperimentSpec":
+        """Create a spec from a dict, rejecting unknown settings"""
+        unknown = set(settings) - set(cls.fields())
+        if unknown:
+            raise ValueError(
+                f"Unknown experiment settings {sorted(unknown)}, "
+                f"expected some of {cls.fields()}"
+            )
+        return cls(**settings)
+
+    @classmethod
+    def fields(cls) -> list[str]:
+        """Names of the settings of a spec"""
+        return [
+            name
+            for name, value in vars(cls).items()
+            if isinstance(value, Field)
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.fields()}
+
+
+def run_experiment(
+    spec: ExperimentSpec,
+    keep_results: bool = False,
+    progress: Callable[[RunningStats], None] | None = None,
+) -> tuple[dict[str, Any], np.ndarray | None]:
+    """Run the experiment with the fastest available engine.
+
+    A single worker runs the vectorized sampler chunk by chunk; several
+    workers run seeded shards of chunk_size trials in worker processes.
+    progress is called with the statistics so far after each chunk or
+    shard. Returns a JSON-ready summary, and the raw results if
+    keep_results is True (single worker only).
+    """
+    seed = np.random.SeedSequence(spec.seed).entropy
+    sampler = SAMPLERS[spec.trial]
+    started = time.perf_counter()
+
+    if spec.workers > 1:
+        from probability_simulator.distributed import (
+            SamplerTask,
+            ShardCoordinator,
+        )
+
+        if keep_results:
+            raise ValueError(
+                "Raw results are only kept when running with one worker"
+            )
+        engine = "distributed"
+        coordinator = ShardCoordinator(spec.ntrials, spec.chunk_size, seed)
+        stats = coordinator.run_local(
+            SamplerTask(spec.bias, sampler, spec.trial_options, spec.rng),
+            nworkers=spec.workers,
+            progress=progress,
+        )
+        results = None
+    else:
+        engine = "vectorized"
+        coin = Coin(spec.bias, rng=make_rng(spec.rng, seed))
+        stats = RunningStats()
+        chunks = []
+        for start in range(0, spec.ntrials, spec.chunk_size):
+            n = min(spec.chunk_size, spec.ntrials - start)
+            chunk = sampler(coin, n, **spec.trial_options)
+            stats.update(chunk)
+            if keep_results:
+                chunks.append(chunk)
+            if progress is not None:
+                progress(stats)
+            if spec.precision is not None and stats.stderr <= spec.precision:
+                break
+        results = np.concatenate(chunks) if keep_results else None
+
+    summary = {
+        "spec": spec.to_dict() | {"seed": seed},
+        "engine": engine,
+        "elapsed_seconds": time.perf_counter() - started,
+        "precision_reached": (
+            None if spec.precision is None else stats.stderr <= spec.precision
+        ),
+        "statistics": {
+            name: None
+            if isinstance(value, float) and math.isnan(value)
+            else value
+            for name, value in stats.to_dict().items()
+        },
+    }
+    return summary, results
+
+
+def _print_progress(ntrials: int) -> Callable[[RunningStats], None]:
+    def report(stats: RunningStats) -> None:
+        print(
+            f"{stats.count}/{ntrials} trials  mean={stats.mean:.6g}  "
+            f"stderr={stats.stderr:.3g}",
+            file=sys.stderr,
+        )
+
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the probability-simulator console script"""
+    parser = argparse.ArgumentParser(
+        prog="probability-simulator",
+        description="Run a coin-flip experiment from a TOML or JSON spec.",
+    )
+    parser.add_argument("spec", type=Path, help="experiment spec file")
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        help="write the JSON summary here instead of to stdout",
+    )
+    parser.add_argument(
+        "--results", type=Path, help="save the raw results as a .npy file"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="don't report progress"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        spec = ExperimentSpec.from_file(args.spec)
+        summary, results = run_experiment(
+            spec,
+            keep_results=args.results is not None,
+            progress=None if args.quiet else _print_progress(spec.ntrials),
+        )
+    except (OSError, ValueError, TypeError, tomllib.TOMLDecodeError) as error:
+        print(f"probability-simulator: error: {error}", file=sys.stderr)
+        return 2
+
+    if args.results is not None:
+        np.save(args.results, results)
+    text = json.dumps(summary, indent=2)
+    if args.summary is None:
+        print(text)
+    else:
+        args.summary.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,24 @@
 """coin_flips.py : Module for simulating coin flips using descriptors"""
 
 import numpy as np
+import itertools
+from collections.abc import Mapping
 from typing import Callable, Any
+from probability_simulator.rng import CounterRNG, make_rng
+from probability_simulator.stats import IntegerHistogram
 from probability_simulator.validation import (
     RealNumberWithinInterval,
     Field,
     CallableField,
+    disabled,
 )
 
+# Upper bound on the number of cells (e.g. trial x flip) that the
+# vectorized engines simulate per block with Coin.flip_paths. Blocks get
+# longer as finished trials are retired, so the memory used per block
+# stays roughly constant.
+BLOCK_CELLS = 2**21
+
 
 class Coin:
     """Class representing a coin"""
@@ -19,15 +30,38 @@ class Coin:
 
         bias: probability of landing on heads (1),
             default is 0.5 for a fair coin
-        rng: random number generator - samples from Uniform(0, 1)
+        rng: random number generator - samples from Uniform(0, 1),
+            or the name of one of rng.BIT_GENERATORS (e.g. "sfc64")
         """
+        if isinstance(rng, str):
+            rng = make_rng(rng)
         self.rng = np.random.default_rng() if rng is None else rng
         self.bias = bias  # RealNumber descriptor will validate automatically
         self._validate_rng(self.rng)
 
+    @classmethod
+    def from_biases(cls, biases, rng=None) -> list["Coin"]:
+        """Create one coin per bias, validating all the biases in one pass.
+        Subclasses get their other settings from their __init__ defaults.
+
+        biases: sequence or array of biases. Every invalid bias is
+            reported together in a single ExceptionGroup.
+        rng: random number generator shared by all of the coins, or the
+            name of one of rng.BIT_GENERATORS, default is a new
+            np.random.default_rng()
+        """
+        if isinstance(rng, str):
+            rng = make_rng(rng)
+        rng = np.random.default_rng() if rng is None else rng
+        biases = cls.bias.validate_many(biases)
+        # already validated, so skip the per-coin checks in __init__
+        with disabled():
+            return [cls(bias=bias, rng=rng) for bias in biases]
+
     @staticmethod
     def _validate_rng(rng) -> None:
-        """Validate that rng has a callable .random() method"""
+        """Validate that rng has a callable .random() method, the only part
+        of rng.RNGBackend a coin uses"""
         if not (hasattr(rng, "random") and callable(rng.random)):
             raise TypeError(
                 "rng should be a random number generator",
@@ -45,6 +79,18 @@ class Coin:
             raise ValueError(f"n must be a positive integer, got {n}")
         return (self.rng.random(n) < self.bias).astype(int)
 
+    def flip_paths(
+        self, npaths: int, nsteps: int, previous: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Simulate nsteps flips on each of npaths independent paths.
+
+        Returns a boolean array of shape (npaths, nsteps), True for heads.
+        previous (the last flip on each path) is accepted so that
+        dependent coins share this signature; flips of an independent
+        coin ignore it.
+        """
+        return self.rng.random((npaths, nsteps)) < self.bias
+
     def __repr__(self) -> str:
         return f"Coin(bias={self.bias})"
 
@@ -55,9 +101,22 @@ class CoinExperiment:
     ntrials = Field(expected_type=int)
     trial_function = CallableField()
 
-    def __init__(self, coin: Coin, ntrials: int = 10000):
+    def __init__(
+        self,
+        coin: Coin,
+        ntrials: int = 10000,
+        counter_rng: CounterRNG | None = None,
+    ):
+        """
+        coin: the coin passed to each trial
+        ntrials: number of trials
+        counter_rng: if given, trial i flips the coin using stream i of
+            counter_rng instead of coin.rng, starting from the coin's
+            state before the run (see create_keyed_experiment)
+        """
         self.coin = coin
         self.ntrials = ntrials
+        self.counter_rng = counter_rng
 
     @classmethod
     def create_seeded_experiment(
@@ -68,13 +127,171 @@ class CoinExperiment:
         coin.rng = seeded_rng
         return cls(coin, ntrials)
 
-    def run_trials(self, trial_function: Callable[[Coin], Any]) -> np.ndarray:
-        """Run multiple trials using a provided trial function"""
+    @classmethod
+    def create_keyed_experiment(
+        cls, coin: Coin, ntrials: int = 10000, seed: int = 43
+    ):
+        """Create a reproducible experiment in which every trial has its own
+        counter-based random stream, keyed by (seed, trial index).
+
+        Any single trial can be recomputed in O(1) with replay_trial(), and
+        ranges of trials give the same results in any order or split.
+        """
+        return cls(coin, ntrials, counter_rng=CounterRNG(seed))
+
+    def run_trials(
+        self,
+        trial_function: Callable[[Coin], Any],
+        start: int = 0,
+        stop: int | None = None,
+    ) -> np.ndarray:
+        """Run multiple trials using a provided trial function
+
+        start, stop: run only trials start, ..., stop - 1 (default all
+            ntrials). Results only depend on the trial indices for keyed
+            experiments.
+        """
         # Validate the trial function using CallableField logic
         CallableField._validate_callable(trial_function, "trial_function")
         self.trial_function = trial_function
-        return np.array(
-            [trial_function(self.coin) for _ in range(self.ntrials)]
+        stop = self.ntrials if stop is None else stop
+        Field.validate_type(start, int, "start", allow_none=False)
+        Field.validate_type(stop, int, "stop", allow_none=False)
+        if not 0 <= start <= stop <= self.ntrials:
+            raise ValueError(
+                f"Need 0 <= start <= stop <= ntrials={self.ntrials}, "
+                f"got start={start}, stop={stop}"
+            )
+        return self._run_range(trial_function, start, stop)
+
+    def replay_trial(self, trial_function: Callable[[Coin], Any], index: int):
+        """Recompute the result of trial number index of a keyed experiment
+        without running any of the trials before it"""
+        if self.counter_rng is None:
+            raise ValueError(
+                "Replaying a single trial needs a keyed experiment, "
+                "see CoinExperiment.create_keyed_experiment"
+            )
+        Field.validate_type(index, int, "index", allow_none=False)
+        if not 0 <= index < self.ntrials:
+            raise ValueError(
+                f"index must be in [0, ntrials={self.ntrials}), got {index}"
+            )
+        return self.run_trials(trial_function, index, index + 1)[0]
+
+    def _run_range(self, trial_function, start: int, stop: int) -> np.ndarray:
+        """Run trials start, ..., stop - 1 and return their results.
+
+        Results of a trial function with a result_dtype (see trial_schema)
+        are written straight into an array of that dtype.
+        """
+        results = self._iter_trials(trial_function, start, stop)
+        dtype = getattr(trial_function, "result_dtype", None)
+        if dtype is None:
+            return np.array(list(results))
+        count = stop - start
+        if dtype.names is not None and count:
+            # the first result tells us whether trials return dicts
+            first = next(results)
+            results = itertools.chain([first], results)
+            if isinstance(first, Mapping):
+                names = dtype.names
+                results = (tuple(r[name] for name in names) for r in results)
+        return np.fromiter(results, dtype=dtype, count=count)
+
+    def _iter_trials(self, trial_function, start: int, stop: int):
+        """Yield the results of trials start, ..., stop - 1"""
+        if self.counter_rng is None:
+            for _ in range(start, stop):
+                yield trial_function(self.coin)
+            return
+
+        # every trial starts from the coin's attributes before the run
+        # (such as MarkovCoin.last_flip), so its result depends only on
+        # its index
+        state = vars(self.coin)
+        original = dict(state)
+        rng = self.counter_rng.generator()
+        trial_state = original | {"rng": rng}
+        seek = self.counter_rng.seek_unchecked
+        try:
+            for index in range(start, stop):
+                state.update(trial_state)
+                seek(rng, index)
+                yield trial_function(self.coin)
+        finally:
+            state.clear()
+            state.update(original)
+
+    def accumulate_trials(
+        self,
+        trial_function: Callable[[Coin], Any],
+        accumulator=None,
+        chunk_size: int = 10000,
+    ):
+        """Run the trials in chunks, feeding each chunk to an accumulator.
+
+        Only one chunk of results is held in memory at a time.
+
+        accumulator: any object with an update(results) method, such as
+            RunningStats or ConvergenceTracker. Default is a new
+            IntegerHistogram, for integer-valued trials.
+        chunk_size: number of trials per chunk
+        Returns the accumulator.
+        """
+        CallableField._validate_callable(trial_function, "trial_function")
+        Field.validate_type(chunk_size, int, "chunk_size", allow_none=False)
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.trial_function = trial_function
+        if accumulator is None:
+            accumulator = IntegerHistogram()
+        for start in range(0, self.ntrials, chunk_size):
+            n = min(chunk_size, self.ntrials - start)
+            accumulator.update(
+                self._run_range(trial_function, start, start + n)
+            )
+        return accumulator
+
+    def run_distributed(
+        self,
+        trial_function: Callable[[Coin], Any],
+        nworkers: int = 2,
+        shard_size: int = 10000,
+        seed: int | None = None,
+        max_retries: int = 3,
+        timeout: float | None = None,
+        keyed: bool = False,
+    ):
+        """Run the trials as seeded shards on local worker processes.
+
+        Each shard flips a copy of this coin (same class, settings and
+        state) using its own child seed, so the result depends only on
+        seed and shard_size, not on nworkers or on which shards had to be
+        retried. With keyed=True, each trial instead draws from its own
+        (seed, trial index) stream, so the trial results don't depend on
+        shard_size either. The coin and trial_function must be picklable.
+        Returns the merged RunningStats of the results.
+        """
+        from probability_simulator.distributed import (
+            KeyedTrialTask,
+            ShardCoordinator,
+            TrialTask,
+        )
+
+        CallableField._validate_callable(trial_function, "trial_function")
+        self.trial_function = trial_function
+        coordinator = ShardCoordinator(
+            self.ntrials, shard_size, seed=seed, max_retries=max_retries
+        )
+        if keyed:
+            task = KeyedTrialTask(self.coin, trial_function, coordinator.seed)
+        else:
+            task = TrialTask(self.coin, trial_function)
+        return coordinator.run_local(
+            task,
+            nworkers=nworkers,
+            timeout=timeout,
         )
 
     @staticmethod
@@ -97,4 +314,35 @@ class CoinExperiment:
                     break
             return count
 
-        return flip_func
+        return trial_schema(np.int64)(flip_func)
+
+
+def trial_schema(dtype=None, **fields):
+    """Decorator declaring the type of a trial function's results.
+
+    run_trials() then writes results straight into a typed array instead
+    of collecting Python objects. Either give one dtype for scalar
+    results, or one dtype per named field for trials that return a tuple
+    (in field order) or a dict; the results are then a structured array
+    (see columns()).
+
+        @trial_schema(flips=np.int64, heads=np.int64)
+        def flips_and_heads(coin): ...
+    """
+    if (dtype is None) == (not fields):
+        raise ValueError("Give either a single dtype or named field dtypes")
+    result_dtype = np.dtype(list(fields.items()) if fields else dtype)
+
+    def decorator(trial_function):
+        CallableField._validate_callable(trial_function, "trial_function")
+        trial_function.result_dtype = result_dtype
+        return trial_function
+
+    return decorator
+
+
+def columns(results: np.ndarray) -> dict[str, np.ndarray]:
+    """Split a structured array of trial results into one array per field"""
+    if results.dtype.names is None:
+        raise ValueError("columns() needs results with named fields")
+    return {name: results[name] for name in results.dtype.names}
@@ -0,0 +1,295 @@
+"""diagnostics.py : Convergence diagnostics for Monte Carlo trial results
+
+Trial results are consumed once, chunk by chunk. Running sums are updated
+per segment between checkpoints, so the cost is linear in the number of
+trials however many checkpoints are reported, and no raw results are kept.
+"""
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+from probability_simulator.stats import IntegerHistogram
+from probability_simulator.validation import Field
+
+
+def log_checkpoints(ntrials: int, per_decade: int = 10) -> np.ndarray:
+    """Log-spaced trial counts from 1 up to and including ntrials"""
+    Field.validate_type(ntrials, int, "ntrials", allow_none=False)
+    if ntrials < 1:
+        raise ValueError(f"ntrials must be a positive integer, got {ntrials}")
+    ndecades = math.log10(ntrials)
+    points = np.logspace(0, ndecades, int(ndecades * per_decade) + 1)
+    return np.unique(np.append(np.rint(points).astype(np.int64), ntrials))
+
+
+def _log_spaced(per_decade: int) -> Iterator[int]:
+    """Endless log-spaced trial counts, for streams of unknown length"""
+    previous = 0
+    for k in itertools.count():
+        point = round(10 ** (k / per_decade))
+        if point > previous:
+            previous = point
+            yield point
+
+
+class _BatchMeans:
+    """Streaming batch-means estimate of the standard error of the mean.
+
+    Keeps between nbatches and 2 * nbatches completed batch sums. When
+    there are 2 * nbatches, neighbouring batches are merged and the batch
+    size doubles, so memory stays O(nbatches) for any number of trials.
+    """
+
+    def __init__(self, nbatches: int) -> None:
+        self.nbatches = nbatches
+        self.batch_size = 1
+        self.sums = np.empty(0)
+        self.partial_sum = 0.0
+        self.partial_count = 0
+
+    def update(self, values: np.ndarray) -> None:
+        while values.size:
+            needed = self.batch_size - self.partial_count
+            if values.size < needed:
+                self.partial_sum += values.sum()
+                self.partial_count += values.size
+                return
+            completed = [self.partial_sum + values[:needed].sum()]
+            values = values[needed:]
+            nfull = values.size // self.batch_size
+            full = values[: nfull * self.batch_size]
+            self.sums = np.concatenate(
+                [
+                    self.sums,
+                    completed,
+                    full.reshape(nfull, self.batch_size).sum(axis=1),
+                ]
+            )
+            values = values[nfull * self.batch_size :]
+            self.partial_sum = 0.0
+            self.partial_count = 0
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Merge neighbouring batches until fewer than 2 * nbatches remain"""
+        while self.sums.size >= 2 * self.nbatches:
+            if self.sums.size % 2:
+                # the unpaired last batch becomes part of the partial one
+                self.partial_sum += self.sums[-1]
+                self.partial_count += self.batch_size
+                self.sums = self.sums[:-1]
+            self.sums = self.sums.reshape(-1, 2).sum(axis=1)
+            self.batch_size *= 2
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean estimated from the batch means"""
+        if self.sums.size < 2:
+            return math.nan
+        means = self.sums / self.batch_size
+        return float(np.std(means, ddof=1) / math.sqrt(means.size))
+
+
+def pmf_distances(
+    counts: np.ndarray, theoretical_pmf: np.ndarray
+) -> tuple[float, float, float]:
+    """Compare observed counts of 0, 1, 2, ... with a theoretical PMF.
+
+    theoretical_pmf[k] is P(X = k). Any mass it leaves out (e.g. the tail
+    of an infinite distribution) is lumped into a single tail bin, as are
+    the counts of values beyond its support.
+
+    Returns the total variation distance, the Kolmogorov-Smirnov distance
+    between the CDFs and Pearson's chi-square statistic.
+    """
+    support = theoretical_pmf.size
+    expected = np.append(theoretical_pmf, max(0.0, 1 - theoretical_pmf.sum()))
+    observed = np.zeros(support + 1)
+    head = counts[:support]
+    observed[: head.size] = head
+    observed[support] = counts[support:].sum()
+    ntrials = observed.sum()
+    empirical = observed / ntrials
+
+    total_variation = 0.5 * np.abs(empirical - expected).sum()
+    ks = np.abs(np.cumsum(empirical - expected)).max()
+    possible = expected > 0
+    if observed[~possible].any():
+        chi_square = math.inf
+    else:
+        n_expected = ntrials * expected[possible]
+        chi_square = (
+            np.square(observed[possible] - n_expected) / n_expected
+        ).sum()
+    return float(total_variation), float(ks), float(chi_square)
+
+
+@dataclass(frozen=True)
+class ConvergenceDiagnostics:
+    """Running estimates at each checkpoint (one array entry per checkpoint).
+
+    checkpoints: number of trials seen
+    mean, stderr: running mean and its standard error
+    batch_stderr: standard error estimated by batch means
+    z_score: (mean - theoretical mean) / stderr, if a mean was given
+    total_variation, ks, chi_square: distances between the empirical PMF
+        and the theoretical one, if a PMF was given
+    """
+
+    checkpoints: np.ndarray
+    mean: np.ndarray
+    stderr: np.ndarray
+    batch_stderr: np.ndarray
+    z_score: np.ndarray
+    total_variation: np.ndarray
+    ks: np.ndarray
+    chi_square: np.ndarray
+
+
+class ConvergenceTracker:
+    """Tracks convergence of a stream of trial results.
+
+    Feed chunks of results with update(); diagnostics are recorded each
+    time the number of trials passes a checkpoint.
+
+    checkpoints: increasing trial counts to report at, default log-spaced
+    theoretical_mean: expected value of a trial, for z-scores
+    theoretical_pmf: P(X = k) for k = 0, 1, ..., for PMF distances. The
+        results must then be non-negative integers.
+    nbatches: minimum number of batches used by the batch-means estimate
+    """
+
+    nbatches = Field(expected_type=int)
+
+    def __init__(
+        self,
+        checkpoints: Iterable[int] | None = None,
+        theoretical_mean: float | None = None,
+        theoretical_pmf: Iterable[float] | None = None,
+        nbatches: int = 32,
+    ):
+        self.nbatches = nbatches
+        if nbatches < 2:
+            raise ValueError(f"nbatches must be at least 2, got {nbatches}")
+        self._checkpoints = iter(
+            _log_spaced(10) if checkpoints is None else checkpoints
+        )
+        self.theoretical_mean = theoretical_mean
+        self.theoretical_pmf = (
+            None
+            if theoretical_pmf is None
+            else np.asarray(theoretical_pmf, dtype=float)
+        )
+
+        self.count = 0
+        self._shift = None  # first value, to keep the sums well conditioned
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._batches = _BatchMeans(nbatches)
+        self._histogram = IntegerHistogram()
+        self._records: list[tuple[float, ...]] = []
+        self._advance_checkpoint()
+
+    def update(self, results) -> None:
+        """Add a chunk of trial results"""
+        results = np.asarray(results).ravel()
+        if self.theoretical_pmf is not None and results.size:
+            if results.dtype.kind not in "biu" or results.min() < 0:
+                raise ValueError(
+                    "Comparing with a theoretical PMF requires results "
+                    "that are non-negative integers"
+                )
+        while results.size:
+            if self._next_checkpoint is None:
+                size = results.size
+            else:
+                size = min(results.size, self._next_checkpoint - self.count)
+            self._add(results[:size])
+            results = results[size:]
+            if self.count == self._next_checkpoint:
+                self._records.append(self._snapshot())
+                self._advance_checkpoint()
+
+    def _advance_checkpoint(self) -> None:
+        """Move on to the next checkpoint past the current count"""
+        checkpoint = next(self._checkpoints, None)
+        while checkpoint is not None and checkpoint <= self.count:
+            checkpoint = next(self._checkpoints, None)
+        self._next_checkpoint = checkpoint
+
+    def _add(self, values: np.ndarray) -> None:
+        """Fold a segment that ends at or before the next checkpoint"""
+        if self._shift is None:
+            self._shift = float(values[0])
+        shifted = values.astype(float) - self._shift
+        self.count += values.size
+        self._sum += shifted.sum()
+        self._sum_squares += np.square(shifted).sum()
+        self._batches.update(shifted)
+        if self.theoretical_pmf is not None:
+            self._histogram.update(values)
+
+    def _snapshot(self) -> tuple[float, ...]:
+        """The diagnostics at the current count"""
+        n = self.count
+        mean = self._sum / n
+        variance = (
+            (self._sum_squares - n * mean**2) / (n - 1) if n > 1 else math.nan
+        )
+        stderr = math.sqrt(max(variance, 0.0) / n)
+        mean += self._shift
+        z_score = math.nan
+        if self.theoretical_mean is not None and stderr > 0:
+            z_score = (mean - self.theoretical_mean) / stderr
+        distances = (math.nan,) * 3
+        if self.theoretical_pmf is not None:
+            # counts of 0, ..., support - 1, then of everything beyond
+            counts = self._histogram.dense_counts(self.theoretical_pmf.size)
+            counts = np.append(counts, n - counts.sum())
+            distances = pmf_distances(counts, self.theoretical_pmf)
+        return (n, mean, stderr, self._batches.stderr, z_score, *distances)
+
+    def diagnostics(self) -> ConvergenceDiagnostics:
+        """Diagnostics at every checkpoint passed so far, and at the
+        current number of trials"""
+        records = self._records
+        if self.count and (not records or records[-1][0] != self.count):
+            records = records + [self._snapshot()]
+        columns = np.array(records, dtype=float).reshape(-1, 8).T
+        return ConvergenceDiagnostics(
+            columns[0].astype(np.int64), *columns[1:]
+        )
+
+
+def convergence_diagnostics(
+    results,
+    checkpoints: Iterable[int] | None = None,
+    theoretical_mean: float | None = None,
+    theoretical_pmf: Iterable[float] | None = None,
+    nbatches: int = 32,
+) -> ConvergenceDiagnostics:
+    """Convergence diagnostics of trial results in a single pass.
+
+    results: an array or sequence of trial results, or an iterator (such
+        as a generator) of arrays, the chunks of a stream. See
+        ConvergenceTracker for the other arguments.
+    """
+    if isinstance(results, Iterator):
+        chunks = results
+    else:
+        results = np.asarray(results).ravel()
+        chunks = [results]
+        if checkpoints is None and results.size:
+            checkpoints = log_checkpoints(results.size)
+    tracker = ConvergenceTracker(
+        checkpoints=checkpoints,
+        theoretical_mean=theoretical_mean,
+        theoretical_pmf=theoretical_pmf,
+        nbatches=nbatches,
+    )
+    for chunk in chunks:
+        tracker.update(chunk)
+    return tracker.diagnostics()
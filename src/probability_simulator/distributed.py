@@ -0,0 +1,394 @@
+"""distributed.py : Running coin experiments as seeded shards across workers
+
+The coordinator splits an experiment into shards, each with its own child
+SeedSequence, and hands them out to workers over a
+multiprocessing.connection socket. Workers send back the RunningStats of
+their shard. Since a shard's result depends only on its seed, failed shards
+can be retried on any worker, and merging the results in shard order gives
+the same answer however the work was scheduled.
+
+Protocol (pickled messages over an authenticated connection):
+    coordinator -> worker: (pickled task, shard), or None to stop. The task
+        is pickled once per experiment and unpickled once per worker.
+    worker -> coordinator: ("ok", RunningStats) or ("error", traceback)
+"""
+
+import copy
+import os
+import pickle
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from functools import reduce
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable
+
+import numpy as np
+from probability_simulator.coin_flips import Coin, CoinExperiment
+from probability_simulator.rng import CounterRNG, make_rng
+from probability_simulator.stats import RunningStats
+from probability_simulator.validation import CallableField, Field
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A slice of an experiment: trials start, ..., start + ntrials - 1,
+    seeded by seed"""
+
+    index: int
+    ntrials: int
+    seed: np.random.SeedSequence
+    start: int = 0
+
+
+def _shard_coin(coin: Coin, rng) -> Coin:
+    """A copy of coin (of the same class, with the same settings and
+    state) that flips using rng"""
+    coin = copy.copy(coin)
+    coin.rng = rng
+    return coin
+
+
+@dataclass(frozen=True)
+class TrialTask:
+    """Runs trial_function on a copy of coin for each shard, with the
+    copy's rng replaced by one seeded with the shard's seed.
+
+    The task is pickled and sent to the workers, so the coin and
+    trial_function must be picklable (e.g. defined at module level, not
+    a lambda or closure).
+    """
+
+    coin: Coin
+    trial_function: Callable[[Coin], Any]
+
+    def __call__(self, shard: Shard) -> RunningStats:
+        coin = _shard_coin(self.coin, np.random.default_rng(shard.seed))
+        experiment = CoinExperiment(coin, ntrials=shard.ntrials)
+        return RunningStats.from_values(
+            experiment.run_trials(self.trial_function)
+        )
+
+
+@dataclass(frozen=True)
+class KeyedTrialTask:
+    """Runs the trials of each shard from counter-based streams keyed by
+    (seed, trial index), like CoinExperiment.create_keyed_experiment.
+
+    Every trial's result depends only on seed and its index, so the raw
+    results are identical for any shard size, order or retry.
+    """
+
+    coin: Coin
+    trial_function: Callable[[Coin], Any]
+    seed: int
+
+    def __call__(self, shard: Shard) -> RunningStats:
+        stop = shard.start + shard.ntrials
+        experiment = CoinExperiment(
+            copy.copy(self.coin),
+            ntrials=stop,
+            counter_rng=CounterRNG(self.seed),
+        )
+        return RunningStats.from_values(
+            experiment.run_trials(self.trial_function, shard.start, stop)
+        )
+
+
+@dataclass(frozen=True)
+class SamplerTask:
+    """Runs a vectorized sampler (see engines.SAMPLERS) for each shard.
+
+    sampler(coin, ntrials, **options) returns an array of ntrials results.
+    backend names the bit generator seeded with each shard's seed.
+    """
+
+    bias: float
+    sampler: Callable[..., np.ndarray]
+    options: dict = field(default_factory=dict)
+    backend: str = "pcg64"
+
+    def __call__(self, shard: Shard) -> RunningStats:
+        coin = Coin(self.bias, rng=make_rng(self.backend, seed=shard.seed))
+        return RunningStats.from_values(
+            self.sampler(coin, shard.ntrials, **self.options)
+        )
+
+
+def _pickle_task(task) -> bytes:
+    """Pickle a task once, before any worker needs it"""
+    CallableField._validate_callable(task, "task")
+    try:
+        return pickle.dumps(task)
+    except (AttributeError, TypeError, pickle.PicklingError) as error:
+        raise TypeError(
+            f"The task {task!r} must be picklable to be sent to workers; "
+            "use a trial function defined at module level, not a lambda "
+            f"or closure ({error})"
+        ) from error
+
+
+def run_worker(address, authkey: bytes) -> None:
+    """Connect to a coordinator at address and run shards until stopped"""
+    pickled_task, task = None, None
+    with Client(address, authkey=authkey) as connection:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            message_task, shard = message
+            try:
+                if message_task != pickled_task:
+                    task = pickle.loads(message_task)
+                    pickled_task = message_task
+                reply = ("ok", task(shard))
+            except Exception:
+                reply = ("error", traceback.format_exc())
+            connection.send(reply)
+
+
+def _wake(listener: Listener) -> None:
+    """Unblock a thread waiting in listener.accept() with a dummy client.
+
+    Closing a listening socket does not interrupt a blocked accept() on
+    every platform. The dummy client never authenticates, so accept()
+    raises and the accepting thread sees that the work is done.
+    """
+    try:
+        Client(listener.address).close()
+    except OSError:
+        pass
+
+
+class ShardCoordinator:
+    """Splits an experiment into seeded shards and collects their results.
+
+    ntrials: total number of trials
+    shard_size: number of trials per shard (the last one may be smaller)
+    seed: root seed of the SeedSequence the shard seeds are spawned from,
+        default is fresh entropy (kept in self.seed for reproducibility)
+    max_retries: number of times a failed shard is retried
+    """
+
+    ntrials = Field(expected_type=int)
+    shard_size = Field(expected_type=int)
+    max_retries = Field(expected_type=int)
+
+    def __init__(
+        self,
+        ntrials: int,
+        shard_size: int = 10000,
+        seed: int | None = None,
+        max_retries: int = 3,
+    ):
+        self.ntrials = ntrials
+        self.shard_size = shard_size
+        self.max_retries = max_retries
+        if ntrials < 1 or shard_size < 1:
+            raise ValueError(
+                "ntrials and shard_size must be positive integers, "
+                f"got {ntrials} and {shard_size}"
+            )
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+
+        root = np.random.SeedSequence(seed)
+        self.seed = root.entropy
+        starts = range(0, ntrials, shard_size)
+        self.shards = [
+            Shard(index, min(shard_size, ntrials - start), child, start)
+            for index, (start, child) in enumerate(
+                zip(starts, root.spawn(len(starts)))
+            )
+        ]
+
+    def _merge(self, results: dict[int, RunningStats]) -> RunningStats:
+        """Merge shard results in shard order, for a reproducible sum"""
+        return reduce(
+            RunningStats.merge,
+            (results[shard.index] for shard in self.shards),
+            RunningStats(),
+        )
+
+    def run_serial(self, task: Callable[[Shard], RunningStats]):
+        """Run every shard in this process, one after the other"""
+        CallableField._validate_callable(task, "task")
+        return self._merge({shard.index: task(shard) for shard in self.shards})
+
+    def serve(
+        self,
+        task: Callable[[Shard], RunningStats],
+        listener: Listener,
+        timeout: float | None = None,
+        workers_alive: Callable[[], bool] | None = None,
+        progress: Callable[[RunningStats], None] | None = None,
+    ) -> RunningStats:
+        """Hand out shards to every worker that connects to listener.
+
+        A shard whose worker raises or disconnects is put back in the
+        queue, up to max_retries times. Returns the merged statistics once
+        every shard has finished; the listener is closed on return.
+
+        timeout: seconds to wait before raising TimeoutError
+        workers_alive: optional check that some worker can still connect
+            or is running; a RuntimeError is raised once it returns False
+        progress: optional callback, called after each shard finishes
+            with the statistics of the shards finished so far
+        Raises TypeError if task can't be pickled.
+        """
+        return self._serve(
+            _pickle_task(task), listener, timeout, workers_alive, progress
+        )
+
+    def _serve(
+        self,
+        pickled_task: bytes,
+        listener: Listener,
+        timeout: float | None,
+        workers_alive: Callable[[], bool] | None,
+        progress: Callable[[RunningStats], None] | None,
+    ) -> RunningStats:
+        """serve() for a task that has already been pickled"""
+        pending = queue.Queue()
+        for shard in self.shards:
+            pending.put(shard)
+        results: dict[int, RunningStats] = {}
+        attempts = dict.fromkeys(range(len(self.shards)), 0)
+        failures: list[str] = []
+        lock = threading.Lock()
+        done = threading.Event()
+        # statistics of the finished shards, in the order they finished
+        finished = RunningStats()
+
+        def shard_failed(shard: Shard, reason: str) -> None:
+            with lock:
+                attempts[shard.index] += 1
+                if attempts[shard.index] > self.max_retries:
+                    failures.append(
+                        f"shard {shard.index} failed after "
+                        f"{attempts[shard.index]} attempts:\n{reason}"
+                    )
+                    done.set()
+                else:
+                    pending.put(shard)
+
+        def handle(connection) -> None:
+            nonlocal finished
+            with connection:
+                while not done.is_set():
+                    try:
+                        shard = pending.get(timeout=0.05)
+                    except queue.Empty:
+                        continue
+                    try:
+                        connection.send((pickled_task, shard))
+                        status, payload = connection.recv()
+                    except (EOFError, OSError):
+                        shard_failed(shard, "worker disconnected")
+                        return
+                    if status != "ok":
+                        shard_failed(shard, payload)
+                        continue
+                    with lock:
+                        results[shard.index] = payload
+                        if len(results) == len(self.shards):
+                            done.set()
+                        if progress is not None:
+                            finished = finished.merge(payload)
+                            progress(finished)
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+
+        handlers: list[threading.Thread] = []
+
+        def accept() -> None:
+            while not done.is_set():
+                try:
+                    connection = listener.accept()
+                except OSError:
+                    return  # listener closed
+                except Exception:
+                    continue  # e.g. a client failed authentication
+                if done.is_set():
+                    connection.close()
+                    return
+                handler = threading.Thread(
+                    target=handle, args=(connection,), daemon=True
+                )
+                handler.start()
+                handlers.append(handler)
+
+        acceptor = threading.Thread(target=accept, daemon=True)
+        acceptor.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while not done.wait(0.05):
+                if workers_alive is not None and not workers_alive():
+                    raise RuntimeError(
+                        "All workers exited before the experiment finished"
+                    )
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Experiment did not finish within {timeout}s"
+                    )
+        finally:
+            done.set()
+            _wake(listener)
+            acceptor.join(timeout=1)
+            listener.close()
+            for handler in handlers:
+                handler.join(timeout=1)
+
+        if failures:
+            raise RuntimeError(failures[0])
+        return self._merge(results)
+
+    def run_local(
+        self,
+        task: Callable[[Shard], RunningStats],
+        nworkers: int = 2,
+        timeout: float | None = None,
+        progress: Callable[[RunningStats], None] | None = None,
+    ) -> RunningStats:
+        """Serve shards to nworkers local worker processes.
+
+        A stand-in for a cluster: the workers talk to the coordinator over
+        a localhost socket using the same protocol as remote workers.
+        See serve() for progress. Raises TypeError, before starting any
+        worker, if task can't be pickled.
+        """
+        Field.validate_type(nworkers, int, "nworkers", allow_none=False)
+        if nworkers < 1:
+            raise ValueError(f"nworkers must be positive, got {nworkers}")
+        pickled_task = _pickle_task(task)
+        authkey = os.urandom(32)
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        # start the workers before serve() starts any threads
+        workers = [
+            Process(target=run_worker, args=(listener.address, authkey))
+            for _ in range(nworkers)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            return self._serve(
+                pickled_task,
+                listener,
+                timeout=timeout,
+                workers_alive=lambda: any(w.is_alive() for w in workers),
+                progress=progress,
+            )
+        finally:
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
@@ -0,0 +1,109 @@
+"""engines.py : Vectorized samplers for common coin-flip trials
+
+Each sampler draws the results of many trials at once and has the same
+distribution as running its scalar reference trial function through
+CoinExperiment.run_trials, which it replaces for large experiments.
+"""
+
+import math
+from functools import partial
+
+import numpy as np
+from probability_simulator.coin_flips import (
+    BLOCK_CELLS,
+    Coin,
+    CoinExperiment,
+)
+from probability_simulator.random_walks import MarkovCoin
+from probability_simulator.validation import Field
+
+
+def _validate_ntrials(ntrials: int) -> None:
+    Field.validate_type(ntrials, int, "ntrials", allow_none=False)
+    if ntrials < 0:
+        raise ValueError(f"ntrials must be non-negative, got {ntrials}")
+
+
+def flips_until(coin: Coin, ntrials: int, outcome: int = 1) -> np.ndarray:
+    """Number of flips until the first `outcome` (1 heads, 0 tails), for
+    each of ntrials trials.
+
+    All unfinished trials are flipped together in blocks; trials are
+    retired from the active set as soon as they see the outcome. Blocks
+    start at twice the expected number of flips and double each round.
+    Dependent coins such as MarkovCoin continue from their last flip.
+    """
+    _validate_ntrials(ntrials)
+    if outcome not in (0, 1):
+        raise ValueError(f"outcome must be 0 or 1, got {outcome}")
+    p_outcome = _probability_after_miss(coin, outcome)
+    if p_outcome == 0:
+        raise ValueError(f"{coin!r} may never land on {outcome}")
+
+    counts = np.empty(ntrials, dtype=np.int64)
+    active = np.arange(ntrials)
+    previous = None
+    flipped = 0
+    # trials still running are in the tail, so blocks double each round
+    block = math.ceil(2 / p_outcome)
+    while active.size:
+        nflips = max(1, min(block, BLOCK_CELLS // active.size))
+        block *= 2
+        flips = coin.flip_paths(active.size, nflips, previous)
+        hits = flips == bool(outcome)
+        done = hits.any(axis=1)
+        counts[active[done]] = flipped + hits[done].argmax(axis=1) + 1
+        active = active[~done]
+        # every trial still running has only seen the other outcome
+        previous = np.full(active.size, not outcome)
+        flipped += nflips
+    return counts
+
+
+def _probability_after_miss(coin: Coin, outcome: int) -> float:
+    """Probability of `outcome` on the flip after one that wasn't it"""
+    if isinstance(coin, MarkovCoin):
+        p_heads = (
+            coin.p_heads_after_tails
+            if outcome == 1
+            else coin.p_heads_after_heads
+        )
+    else:
+        p_heads = coin.bias
+    return p_heads if outcome == 1 else 1 - p_heads
+
+
+def heads_in_n(coin: Coin, ntrials: int, flips: int = 10) -> np.ndarray:
+    """Number of heads in `flips` flips, for each of ntrials trials"""
+    _validate_ntrials(ntrials)
+    Field.validate_type(flips, int, "flips", allow_none=False)
+    if flips < 1:
+        raise ValueError(f"flips must be a positive integer, got {flips}")
+    counts = np.empty(ntrials, dtype=np.int64)
+    chunk = max(1, BLOCK_CELLS // flips)
+    for start in range(0, ntrials, chunk):
+        stop = min(start + chunk, ntrials)
+        counts[start:stop] = coin.flip_paths(stop - start, flips).sum(axis=1)
+    return counts
+
+
+# name -> vectorized sampler(coin, ntrials, **options)
+SAMPLERS = {
+    "flips_until_heads": flips_until,
+    "flips_until_tails": partial(flips_until, outcome=0),
+    "heads_in_n": heads_in_n,
+}
+
+
+def reference_trial(name: str, **options):
+    """The scalar trial function a sampler is equivalent to"""
+    if name == "flips_until_heads":
+        return CoinExperiment.flips_until(lambda flip: flip == 1)
+    if name == "flips_until_tails":
+        return CoinExperiment.flips_until(lambda flip: flip == 0)
+    if name == "heads_in_n":
+        flips = options.get("flips", 10)
+        return lambda coin: int(sum(coin.flip() for _ in range(flips)))
+    raise ValueError(
+        f"Unknown trial type {name!r}, choose one of {sorted(SAMPLERS)}"
+    )
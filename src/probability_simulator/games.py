@@ -0,0 +1,330 @@
+"""games.py : Multi-coin races and pattern games on batched draws"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from probability_simulator.coin_flips import BLOCK_CELLS, Coin
+from probability_simulator.validation import Field
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Outcome of many trials of a game between several players.
+
+    winners: index of the winning player, -1 for a tie or an unfinished game
+    times: round in which each game ended, -1 if it didn't end in time
+    nplayers: number of players
+    """
+
+    winners: np.ndarray
+    times: np.ndarray
+    nplayers: int
+
+    @property
+    def finished(self) -> np.ndarray:
+        """Mask of the games that ended within the maximum number of rounds"""
+        return self.times >= 0
+
+    @property
+    def ties(self) -> np.ndarray:
+        """Mask of the games that ended with several players winning at once"""
+        return self.finished & (self.winners == -1)
+
+    def win_probabilities(self) -> np.ndarray:
+        """Fraction of all games won by each player"""
+        wins = np.bincount(
+            self.winners[self.winners >= 0], minlength=self.nplayers
+        )
+        return wins / self.winners.size
+
+
+@dataclass(frozen=True)
+class Tournament:
+    """First occurrences of several patterns in the same flip sequences.
+
+    Every pairwise game between the patterns (the first pattern to appear
+    wins) is decided by comparing their first occurrences, so a whole
+    tournament is played on one set of simulated sequences.
+
+    patterns: the patterns, as strings of H and T
+    times: (ntrials, npatterns) number of flips until each pattern first
+        appeared, -1 if it didn't appear within the maximum number of flips
+    """
+
+    patterns: tuple[str, ...]
+    times: np.ndarray
+
+    def _times_or_never(self) -> np.ndarray:
+        """times, with patterns that never appeared at the largest int"""
+        never = np.iinfo(self.times.dtype).max
+        return np.where(self.times >= 0, self.times, never)
+
+    def win_matrix(self) -> np.ndarray:
+        """P(row pattern appears strictly before column pattern).
+
+        A pattern that didn't appear in time beats no one, and a trial in
+        which neither pattern of a pair appeared counts for neither.
+        """
+        times = self._times_or_never()
+        return (times[:, :, None] < times[:, None, :]).mean(axis=0)
+
+    def draw_matrix(self) -> np.ndarray:
+        """P(row and column pattern first appear on the same flip), which
+        happens when one pattern ends with the other"""
+        times = self.times
+        same = (times[:, :, None] == times[:, None, :]) & (
+            times[:, :, None] >= 0
+        )
+        return same.mean(axis=0)
+
+
+def _parse_pattern(pattern: str) -> np.ndarray:
+    """Boolean array of a pattern of H (heads) and T (tails)"""
+    Field.validate_type(pattern, str, "pattern", allow_none=False)
+    if not pattern or set(pattern) - {"H", "T"}:
+        raise ValueError(
+            f"pattern must be a non-empty string of H and T, got {pattern!r}"
+        )
+    return np.array([flip == "H" for flip in pattern])
+
+
+def _pattern_hits(
+    extended: np.ndarray, pattern: np.ndarray, nsteps: int, elapsed: int
+) -> np.ndarray:
+    """Mask of the flips of a block at which pattern ends.
+
+    extended: the flips of the block (last axis) preceded by the flips just
+        before it, at least len(pattern) - 1 of them
+    elapsed: number of flips before the block; flips before the first one
+        are not real and never complete a pattern
+    """
+    width = extended.shape[-1] - nsteps
+    hits = np.ones(extended.shape[:-1] + (nsteps,), dtype=bool)
+    for offset, flip in enumerate(pattern, start=width - pattern.size + 1):
+        segment = extended[..., offset : offset + nsteps]
+        hits &= segment if flip else ~segment
+    hits[..., : max(0, pattern.size - 1 - elapsed)] = False
+    return hits
+
+
+def _first_hits(hits: np.ndarray) -> np.ndarray:
+    """Index of the first True along the last axis, or its length if none"""
+    return np.where(hits.any(axis=-1), hits.argmax(axis=-1), hits.shape[-1])
+
+
+def _validate_max_rounds(max_rounds: int, name: str) -> None:
+    Field.validate_type(max_rounds, int, name, allow_none=False)
+    if max_rounds < 1:
+        raise ValueError(
+            f"{name} must be a positive integer, got {max_rounds}"
+        )
+
+
+class MultiCoinExperiment:
+    """Games between several coins, one player per coin.
+
+    Every round each player flips their own coin. All players of all
+    unfinished trials are simulated together: each block of rounds is one
+    array of uniform draws of shape (trials, coins, rounds), and trials are
+    retired from the active set as soon as their game is decided.
+
+    coins: the players' coins. Each is flipped independently with its
+        bias, so coins with memory (like MarkovCoin) are not supported.
+    ntrials: number of games played
+    rng: random number generator for the batched draws, default is the
+        first coin's rng
+    """
+
+    ntrials = Field(expected_type=int)
+
+    def __init__(self, coins, ntrials: int = 10000, rng=None) -> None:
+        self.coins = list(coins)
+        if len(self.coins) < 2:
+            raise ValueError(
+                f"A game needs at least two coins, got {len(self.coins)}"
+            )
+        for coin in self.coins:
+            if not isinstance(coin, Coin):
+                raise TypeError(f"Expected a Coin, got {type(coin)}")
+            if type(coin).flip_paths is not Coin.flip_paths:
+                raise ValueError(
+                    f"{coin!r} doesn't flip independently, only coins with "
+                    "a fixed bias can share batched draws"
+                )
+        self.ntrials = ntrials
+        if ntrials < 1:
+            raise ValueError(
+                f"ntrials must be a positive integer, got {ntrials}"
+            )
+        self.rng = self.coins[0].rng if rng is None else rng
+        Coin._validate_rng(self.rng)
+
+    @property
+    def biases(self) -> np.ndarray:
+        """Bias of each player's coin"""
+        return np.array([coin.bias for coin in self.coins])
+
+    def _play(self, advance, first_block: int, max_rounds: int) -> GameResult:
+        """Play all the games in blocks of rounds.
+
+        advance(state, flips, elapsed) gets the (trials, coins,
+        rounds) flips of the active trials and their per-trial state, and
+        returns the round within the block at which each player first met
+        their goal (the block length if they didn't), and the state of
+        every active trial after the block.
+        """
+        ncoins = len(self.coins)
+        biases = self.biases[:, None]
+        winners = np.full(self.ntrials, -1, dtype=np.int64)
+        times = np.full(self.ntrials, -1, dtype=np.int64)
+
+        active = np.arange(self.ntrials)
+        state = None
+        elapsed = 0
+        block = first_block
+        while active.size and elapsed < max_rounds:
+            nsteps = min(
+                max_rounds - elapsed,
+                block,
+                max(1, BLOCK_CELLS // (active.size * ncoins)),
+            )
+            block *= 2
+            flips = self.rng.random((active.size, ncoins, nsteps)) < biases
+            first, state = advance(state, flips, elapsed)
+
+            end = first.min(axis=1)
+            done = end < nsteps
+            leaders = first == end[:, None]
+            winner = np.where(leaders.sum(axis=1) == 1, leaders.argmax(1), -1)
+            finished = active[done]
+            times[finished] = elapsed + end[done] + 1
+            winners[finished] = winner[done]
+
+            active = active[~done]
+            state = state[~done]
+            elapsed += nsteps
+        return GameResult(winners=winners, times=times, nplayers=ncoins)
+
+    def race(self, target_heads: int = 1, max_rounds: int = 10**6):
+        """Each round every player flips; the first to reach target_heads
+        heads wins, and players reaching it in the same round tie.
+
+        Games undecided after max_rounds rounds are reported with time -1.
+        """
+        Field.validate_type(
+            target_heads, int, "target_heads", allow_none=False
+        )
+        if target_heads < 1:
+            raise ValueError(
+                f"target_heads must be a positive integer, got {target_heads}"
+            )
+        _validate_max_rounds(max_rounds, "max_rounds")
+        best_bias = self.biases.max()
+        if best_bias == 0:
+            raise ValueError("No coin can ever land on heads")
+
+        def advance(heads, flips, elapsed):
+            totals = np.cumsum(flips, axis=2, dtype=np.int64)
+            if heads is not None:
+                totals += heads[:, :, None]
+            return _first_hits(totals >= target_heads), totals[:, :, -1]
+
+        first_block = int(np.ceil(2 * target_heads / best_bias))
+        return self._play(advance, first_block, max_rounds)
+
+    def pattern_race(self, patterns, max_rounds: int = 10**6) -> GameResult:
+        """Player i flips their own coin until patterns[i] (a string of H
+        and T, such as "HTH") appears; the first to see their pattern wins,
+        and players seeing theirs in the same round tie.
+
+        Games undecided after max_rounds rounds are reported with time -1.
+        """
+        patterns = [_parse_pattern(pattern) for pattern in patterns]
+        if len(patterns) != len(self.coins):
+            raise ValueError(
+                f"Need one pattern per coin, got {len(patterns)} patterns "
+                f"for {len(self.coins)} coins"
+            )
+        _validate_max_rounds(max_rounds, "max_rounds")
+        # flips kept from one block to the next to complete patterns
+        width = max(pattern.size for pattern in patterns) - 1
+
+        def advance(history, flips, elapsed):
+            if history is None:
+                history = np.zeros(flips.shape[:2] + (width,), dtype=bool)
+            extended = np.concatenate([history, flips], axis=2)
+            nsteps = flips.shape[2]
+            first = np.stack(
+                [
+                    _first_hits(
+                        _pattern_hits(extended[:, i], pattern, nsteps, elapsed)
+                    )
+                    for i, pattern in enumerate(patterns)
+                ],
+                axis=1,
+            )
+            return first, extended[:, :, extended.shape[2] - width :]
+
+        first_block = 2 ** (width + 2)
+        return self._play(advance, first_block, max_rounds)
+
+    def __repr__(self) -> str:
+        return (
+            f"MultiCoinExperiment(coins={self.coins}, ntrials={self.ntrials})"
+        )
+
+
+def penney_tournament(
+    coin: Coin, patterns, ntrials: int = 10000, max_flips: int = 10**6
+) -> Tournament:
+    """Play every pair of patterns against each other on shared flips.
+
+    In Penney's game both players watch the same sequence of flips of one
+    coin, and whoever's pattern appears first wins. Here each trial flips
+    the coin until every pattern has appeared (or max_flips flips), with
+    all unfinished trials flipped together in blocks, and the first
+    occurrence of every pattern is recorded. Dependent coins such as
+    MarkovCoin are supported.
+
+    patterns: strings of H and T, such as ["HHT", "THH"]
+    """
+    patterns = tuple(patterns)
+    parsed = [_parse_pattern(pattern) for pattern in patterns]
+    if not parsed:
+        raise ValueError("Need at least one pattern")
+    Field.validate_type(ntrials, int, "ntrials", allow_none=False)
+    if ntrials < 1:
+        raise ValueError(f"ntrials must be a positive integer, got {ntrials}")
+    _validate_max_rounds(max_flips, "max_flips")
+
+    width = max(pattern.size for pattern in parsed) - 1
+    times = np.full((ntrials, len(parsed)), -1, dtype=np.int64)
+
+    active = np.arange(ntrials)
+    history = np.zeros((ntrials, width), dtype=bool)
+    previous = None
+    elapsed = 0
+    block = 2 ** (width + 2)
+    while active.size and elapsed < max_flips:
+        nsteps = min(
+            max_flips - elapsed, block, max(1, BLOCK_CELLS // active.size)
+        )
+        block *= 2
+        flips = coin.flip_paths(active.size, nsteps, previous)
+        extended = np.concatenate([history, flips], axis=1)
+
+        found = times[active] >= 0
+        for j, pattern in enumerate(parsed):
+            first = _first_hits(
+                _pattern_hits(extended, pattern, nsteps, elapsed)
+            )
+            new = ~found[:, j] & (first < nsteps)
+            times[active[new], j] = elapsed + first[new] + 1
+            found[new, j] = True
+
+        running = ~found.all(axis=1)
+        active = active[running]
+        history = extended[running, extended.shape[1] - width :]
+        previous = flips[running, -1]
+        elapsed += nsteps
+    return Tournament(patterns=patterns, times=times)
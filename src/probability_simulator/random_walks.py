@@ -0,0 +1,254 @@
+"""random_walks.py : Markov-dependent coins and vectorized ±1 random walks"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from probability_simulator.coin_flips import BLOCK_CELLS, Coin
+from probability_simulator.validation import Field, RealNumberWithinInterval
+
+
+class MarkovCoin(Coin):
+    """A coin whose bias depends on the outcome of the previous flip.
+
+    bias: probability of heads on the first flip
+    p_heads_after_heads: probability of heads given the last flip was heads
+    p_heads_after_tails: probability of heads given the last flip was tails
+    """
+
+    p_heads_after_heads = RealNumberWithinInterval(
+        interval="[0,1]", auto_convert=True
+    )
+    p_heads_after_tails = RealNumberWithinInterval(
+        interval="[0,1]", auto_convert=True
+    )
+
+    def __init__(
+        self,
+        p_heads_after_heads=0.5,
+        p_heads_after_tails=0.5,
+        bias=0.5,
+        rng=None,
+    ) -> None:
+        super().__init__(bias=bias, rng=rng)
+        self.p_heads_after_heads = p_heads_after_heads
+        self.p_heads_after_tails = p_heads_after_tails
+        self.last_flip = None
+
+    @property
+    def stationary_bias(self) -> float:
+        """Long-run fraction of heads of the two-state chain"""
+        denominator = 1 - self.p_heads_after_heads + self.p_heads_after_tails
+        if denominator == 0:
+            # always heads after heads, never heads after tails:
+            # the chain never leaves its first state
+            return self.bias
+        return self.p_heads_after_tails / denominator
+
+    def _heads_probability(self, previous):
+        """Probability of heads given the previous flip(s)"""
+        if previous is None:
+            return self.bias
+        return np.where(
+            previous, self.p_heads_after_heads, self.p_heads_after_tails
+        )
+
+    def flip(self) -> int:
+        """Flip the coin once, conditioning on the last flip"""
+        self.last_flip = int(
+            self.rng.random() < self._heads_probability(self.last_flip)
+        )
+        return self.last_flip
+
+    def flip_n(self, n: int) -> np.ndarray:
+        """Flip the coin n times in sequence"""
+        Field.validate_type(n, int, "n (number of trials)", allow_none=False)
+        if n < 1:
+            raise ValueError(f"n must be a positive integer, got {n}")
+        previous = (
+            None if self.last_flip is None else np.array([self.last_flip])
+        )
+        flips = self.flip_paths(1, n, previous=previous)[0]
+        self.last_flip = int(flips[-1])
+        return flips.astype(int)
+
+    def flip_paths(
+        self, npaths: int, nsteps: int, previous: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Simulate nsteps dependent flips on each of npaths paths.
+
+        The chain is advanced one step at a time for all paths at once.
+        previous holds the last flip of each path, or None to start every
+        path from `bias`. Returns a boolean array of shape (npaths, nsteps).
+        """
+        uniforms = self.rng.random((nsteps, npaths))
+        flips = np.empty((nsteps, npaths), dtype=bool)
+        for step in range(nsteps):
+            previous = uniforms[step] < self._heads_probability(previous)
+            flips[step] = previous
+        return flips.T
+
+    def __repr__(self) -> str:
+        return (
+            f"MarkovCoin(p_heads_after_heads={self.p_heads_after_heads}, "
+            f"p_heads_after_tails={self.p_heads_after_tails}, "
+            f"bias={self.bias})"
+        )
+
+
+@dataclass(frozen=True)
+class WalkResult:
+    """Outcome of simulating many random walks up to absorption.
+
+    times: step at which each path was absorbed, -1 if it never was
+    final_positions: absorbing barrier reached, or the last position
+    maxima: highest position each path visited
+    """
+
+    times: np.ndarray
+    final_positions: np.ndarray
+    maxima: np.ndarray
+
+    @property
+    def absorbed(self) -> np.ndarray:
+        """Mask of the paths that hit a barrier"""
+        return self.times >= 0
+
+    def hitting_time_distribution(self) -> np.ndarray:
+        """Empirical P(T = t), indexed by t, over all simulated paths.
+
+        Paths that were never absorbed are left out, so the total mass is
+        the fraction of absorbed paths.
+        """
+        return np.bincount(self.times[self.absorbed]) / self.times.size
+
+    def absorption_probability(self, barrier: int) -> float:
+        """Fraction of paths absorbed at the given barrier"""
+        hits = self.absorbed & (self.final_positions == barrier)
+        return float(np.mean(hits))
+
+
+class RandomWalk:
+    """±1 random walks driven by coin flips (heads = +1, tails = -1).
+
+    All paths are advanced together as a matrix of (path, step) flips.
+    """
+
+    npaths = Field(expected_type=int)
+    start = Field(expected_type=int)
+
+    def __init__(self, coin: Coin, npaths: int = 10000, start: int = 0):
+        self.coin = coin
+        self.npaths = npaths
+        if npaths < 1:
+            raise ValueError(
+                f"npaths must be a positive integer, got {npaths}"
+            )
+        self.start = start
+
+    def paths(self, nsteps: int) -> np.ndarray:
+        """Return the positions of every path over nsteps steps.
+
+        The result has shape (npaths, nsteps + 1); column 0 is `start`.
+        """
+        Field.validate_type(nsteps, int, "nsteps", allow_none=False)
+        if nsteps < 1:
+            raise ValueError(
+                f"nsteps must be a positive integer, got {nsteps}"
+            )
+        steps = 2 * self.coin.flip_paths(self.npaths, nsteps).astype(np.int64)
+        positions = np.empty((self.npaths, nsteps + 1), dtype=np.int64)
+        positions[:, 0] = self.start
+        np.cumsum(steps - 1, axis=1, out=positions[:, 1:])
+        positions[:, 1:] += self.start
+        return positions
+
+    def _validate_barriers(self, lower, upper) -> None:
+        """Check the barriers are integers on either side of `start`"""
+        Field.validate_type(lower, int, "lower", allow_none=True)
+        Field.validate_type(upper, int, "upper", allow_none=True)
+        if lower is not None and lower >= self.start:
+            raise ValueError(
+                f"lower barrier must be below start={self.start}, got {lower}"
+            )
+        if upper is not None and upper <= self.start:
+            raise ValueError(
+                f"upper barrier must be above start={self.start}, got {upper}"
+            )
+
+    def run_until_absorbed(
+        self,
+        lower: int | None = None,
+        upper: int | None = None,
+        max_steps: int = 10**6,
+    ) -> WalkResult:
+        """Simulate every path until it hits an absorbing barrier.
+
+        Absorbed paths are retired from the active set after each block,
+        so later blocks only simulate the paths that are still running.
+        Paths still running after max_steps are reported with time -1.
+
+        lower, upper: absorbing barriers (None for no barrier)
+        max_steps: maximum number of steps simulated for any path
+        """
+        self._validate_barriers(lower, upper)
+        Field.validate_type(max_steps, int, "max_steps", allow_none=False)
+        if max_steps < 1:
+            raise ValueError(
+                f"max_steps must be a positive integer, got {max_steps}"
+            )
+
+        times = np.full(self.npaths, -1, dtype=np.int64)
+        final_positions = np.empty(self.npaths, dtype=np.int64)
+        maxima = np.empty(self.npaths, dtype=np.int64)
+
+        # state of the active paths, compacted as paths are absorbed
+        index = np.arange(self.npaths)
+        position = np.full(self.npaths, self.start, dtype=np.int64)
+        maximum = position.copy()
+        previous = None
+        elapsed = 0
+
+        while index.size and elapsed < max_steps:
+            nsteps = min(max_steps - elapsed, BLOCK_CELLS // index.size or 1)
+            flips = self.coin.flip_paths(index.size, nsteps, previous)
+            block = np.cumsum(2 * flips.astype(np.int64) - 1, axis=1)
+            block += position[:, None]
+
+            hit = np.zeros(block.shape, dtype=bool)
+            if lower is not None:
+                hit |= block <= lower
+            if upper is not None:
+                hit |= block >= upper
+            done = hit.any(axis=1)
+            # last column simulated for each path in this block
+            column = np.where(done, hit.argmax(axis=1), nsteps - 1)
+            rows = np.arange(index.size)
+
+            position = block[rows, column]
+            maximum = np.maximum(
+                maximum, np.maximum.accumulate(block, axis=1)[rows, column]
+            )
+
+            finished = index[done]
+            times[finished] = elapsed + column[done] + 1
+            final_positions[finished] = position[done]
+            maxima[finished] = maximum[done]
+
+            running = ~done
+            index = index[running]
+            position = position[running]
+            maximum = maximum[running]
+            previous = flips[running, -1]
+            elapsed += nsteps
+
+        final_positions[index] = position
+        maxima[index] = maximum
+        return WalkResult(
+            times=times, final_positions=final_positions, maxima=maxima
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RandomWalk(coin={self.coin}, npaths={self.npaths}, "
+            f"start={self.start})"
+        )
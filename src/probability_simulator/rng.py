@@ -0,0 +1,155 @@
+"""rng.py : Random number generator backends for coins and experiments"""
+
+import time
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+from probability_simulator.validation import Field
+
+# name -> NumPy bit generator
+BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "pcg64dxsm": np.random.PCG64DXSM,
+    "sfc64": np.random.SFC64,
+    "philox": np.random.Philox,
+    "mt19937": np.random.MT19937,
+}
+
+# Philox produces four 64-bit outputs per counter value
+_PHILOX_OUTPUTS_PER_COUNTER = 4
+
+
+@runtime_checkable
+class RawBits(Protocol):
+    """A source of raw random bits, such as a NumPy BitGenerator.
+
+    random_raw(size) returns size uniformly random 64-bit outputs as a
+    uint64 array.
+    """
+
+    def random_raw(self, size=None, output=True): ...
+
+
+@runtime_checkable
+class RNGBackend(Protocol):
+    """Interface of a random number generator backend.
+
+    random() with no arguments returns one Uniform(0, 1) sample. Batched
+    draws pass size, and may pass out to fill a preallocated float64 array
+    instead of allocating a new one. bit_generator gives raw-bits access
+    (see RawBits). np.random.Generator satisfies this.
+
+    A Coin only needs random(), which Coin checks on construction;
+    random_raw() checks the whole interface before reading raw bits.
+    """
+
+    bit_generator: RawBits
+
+    def random(self, size=None, dtype=np.float64, out=None): ...
+
+
+def make_rng(backend: str = "pcg64", seed=None) -> np.random.Generator:
+    """Create a Generator using one of the BIT_GENERATORS by name.
+
+    seed: anything np.random.SeedSequence accepts, default fresh entropy
+    """
+    Field.validate_type(backend, str, "backend", allow_none=False)
+    if backend not in BIT_GENERATORS:
+        raise ValueError(
+            f"Unknown RNG backend {backend!r}, "
+            f"choose one of {sorted(BIT_GENERATORS)}"
+        )
+    return np.random.Generator(BIT_GENERATORS[backend](seed))
+
+
+def random_raw(rng: RNGBackend, n: int) -> np.ndarray:
+    """n raw 64-bit outputs from the bit generator behind rng"""
+    if not (
+        isinstance(rng, RNGBackend) and isinstance(rng.bit_generator, RawBits)
+    ):
+        raise TypeError(
+            "rng must be an RNGBackend whose bit_generator has a "
+            f"random_raw() method, got {type(rng).__name__}"
+        )
+    return rng.bit_generator.random_raw(n)
+
+
+class CounterRNG:
+    """Counter-based random streams with random access (Philox4x64).
+
+    The output of a counter-based generator is a function of (key,
+    counter), so any draw of any stream can be reached in O(1) by setting
+    the counter, without replaying earlier draws. Stream s occupies the
+    counters (c, 0, s, 0) for c = 0, 1, ..., so distinct streams never
+    overlap unless one uses more than 2**66 draws.
+
+    seed: anything np.random.SeedSequence accepts, default fresh entropy.
+        The key derived from it is kept in self.key.
+    """
+
+    def __init__(self, seed=None) -> None:
+        seed_sequence = np.random.SeedSequence(seed)
+        self.seed = seed_sequence.entropy
+        self.key = seed_sequence.generate_state(2, dtype=np.uint64)
+        # state of a fresh generator with this key; seeking only changes
+        # its counter and assigns it, instead of rebuilding a state dict
+        self._state = np.random.Philox(key=self.key).state
+
+    def generator(self, stream: int = 0, position: int = 0):
+        """A Generator whose next 64-bit draw is draw `position` of
+        `stream`. Each float64 from .random() uses one draw."""
+        rng = np.random.Generator(np.random.Philox(key=self.key))
+        return self.seek(rng, stream, position)
+
+    def seek(
+        self, rng: np.random.Generator, stream: int = 0, position: int = 0
+    ) -> np.random.Generator:
+        """Move a Generator made by generator() to draw `position` of
+        `stream`, in place. Cheaper than creating a new generator."""
+        Field.validate_type(stream, int, "stream", allow_none=False)
+        Field.validate_type(position, int, "position", allow_none=False)
+        if stream < 0 or position < 0:
+            raise ValueError(
+                "stream and position must be non-negative, "
+                f"got {stream} and {position}"
+            )
+        return self.seek_unchecked(rng, stream, position)
+
+    def seek_unchecked(
+        self, rng: np.random.Generator, stream: int, position: int = 0
+    ) -> np.random.Generator:
+        """seek() without argument validation, for per-trial use in hot
+        loops. stream and position must be non-negative ints."""
+        block, offset = divmod(position, _PHILOX_OUTPUTS_PER_COUNTER)
+        counter = self._state["state"]["counter"]
+        counter[0] = block
+        counter[2] = stream
+        rng.bit_generator.state = self._state
+        if offset:
+            rng.bit_generator.random_raw(offset)
+        return rng
+
+    def __repr__(self) -> str:
+        return f"CounterRNG(seed={self.seed})"
+
+
+def benchmark_backends(
+    n: int = 10**7, repeat: int = 3, backends=None
+) -> dict[str, float]:
+    """Uniform draws per second of each backend (best of repeat runs).
+
+    Draws are written into a preallocated buffer with random(out=), so the
+    numbers measure the generators rather than memory allocation.
+    """
+    Field.validate_type(n, int, "n", allow_none=False)
+    buffer = np.empty(n)
+    throughput = {}
+    for backend in backends or BIT_GENERATORS:
+        rng = make_rng(backend, seed=0)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rng.random(out=buffer)
+            best = min(best, time.perf_counter() - start)
+        throughput[backend] = n / best
+    return throughput
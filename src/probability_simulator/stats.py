@@ -0,0 +1,226 @@
+"""stats.py : Online statistics that can be merged across chunks and shards"""
+
+import math
+
+import numpy as np
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of a stream of numbers.
+
+    Statistics of separate chunks are combined with merge(), using Chan et
+    al.'s pairwise update of the sum of squared deviations. The merge is
+    associative, so shards can be summarised independently and combined
+    afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.sum_squared_deviations = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def from_values(cls, values) -> "RunningStats":
+        """Summarise an array of values in one vectorized pass"""
+        values = np.asarray(values, dtype=float).ravel()
+        stats = cls()
+        if values.size:
+            stats.count = values.size
+            stats.mean = float(values.mean())
+            stats.sum_squared_deviations = float(
+                np.square(values - stats.mean).sum()
+            )
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+        return stats
+
+    def update(self, values) -> None:
+        """Add a chunk of values to the statistics in place"""
+        self._combine(self.from_values(values))
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Return the statistics of both streams combined"""
+        merged = RunningStats()
+        merged._combine(self)
+        merged._combine(other)
+        return merged
+
+    def _combine(self, other: "RunningStats") -> None:
+        """Fold the statistics of other into self"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.sum_squared_deviations += (
+            other.sum_squared_deviations
+            + delta**2 * self.count * other.count / count
+        )
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (with Bessel's correction)"""
+        if self.count < 2:
+            return math.nan
+        return self.sum_squared_deviations / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean"""
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(self.variance / self.count)
+
+    def to_dict(self) -> dict[str, float]:
+        """Summary of the statistics as plain Python numbers"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "stderr": self.stderr,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RunningStats):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"RunningStats(count={self.count}, mean={self.mean}, "
+            f"std={self.std})"
+        )
+
+
+class IntegerHistogram:
+    """Counts of integer-valued trial results, built up chunk by chunk.
+
+    Values in [0, max_dense_bins) are counted with np.bincount into a dense
+    array that grows (by doubling) only as far as the largest value seen.
+    Negative values and values in a long right tail are kept in a sparse
+    {value: count} dict instead, so a rare huge value costs one entry
+    rather than a huge array. Raw results are never stored.
+    """
+
+    def __init__(self, max_dense_bins: int = 2**16) -> None:
+        if max_dense_bins < 1:
+            raise ValueError(
+                f"max_dense_bins must be positive, got {max_dense_bins}"
+            )
+        self.max_dense_bins = max_dense_bins
+        self.count = 0
+        self._dense = np.zeros(0, dtype=np.int64)
+        self._sparse: dict[int, int] = {}
+
+    def _grow(self, nbins: int) -> None:
+        """Make room in the dense array for values below nbins"""
+        if nbins <= self._dense.size:
+            return
+        capacity = min(self.max_dense_bins, max(nbins, 2 * self._dense.size))
+        dense = np.zeros(capacity, dtype=np.int64)
+        dense[: self._dense.size] = self._dense
+        self._dense = dense
+
+    def update(self, values) -> None:
+        """Count a chunk of integer values"""
+        values = np.asarray(values).ravel()
+        if values.size == 0:
+            return
+        if values.dtype.kind not in "biu":
+            raise TypeError(
+                "IntegerHistogram only counts integer values, "
+                f"got an array of {values.dtype}"
+            )
+        in_dense = (values >= 0) & (values < self.max_dense_bins)
+        if not in_dense.all():
+            outside, counts = np.unique(values[~in_dense], return_counts=True)
+            for value, count in zip(outside.tolist(), counts.tolist()):
+                self._sparse[value] = self._sparse.get(value, 0) + count
+            values = values[in_dense]
+        if values.size:
+            counts = np.bincount(values.astype(np.intp, copy=False))
+            self._grow(counts.size)
+            self._dense[: counts.size] += counts
+        self.count += in_dense.size
+
+    def merge(self, other: "IntegerHistogram") -> "IntegerHistogram":
+        """Return the histogram of both sets of results combined"""
+        merged = IntegerHistogram(self.max_dense_bins)
+        for histogram in (self, other):
+            values, counts = histogram.values_and_counts()
+            merged._add_counts(values, counts)
+        return merged
+
+    def _add_counts(self, values: np.ndarray, counts: np.ndarray) -> None:
+        """Add counts of distinct values"""
+        in_dense = (values >= 0) & (values < self.max_dense_bins)
+        for value, count in zip(
+            values[~in_dense].tolist(), counts[~in_dense].tolist()
+        ):
+            self._sparse[value] = self._sparse.get(value, 0) + count
+        if in_dense.any():
+            self._grow(int(values[in_dense].max()) + 1)
+            self._dense[values[in_dense]] += counts[in_dense]
+        self.count += int(counts.sum())
+
+    def values_and_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sorted distinct values seen, and how often each was seen"""
+        dense_values = np.flatnonzero(self._dense)
+        sparse_values = np.fromiter(self._sparse, dtype=np.int64)
+        sparse_counts = np.fromiter(self._sparse.values(), dtype=np.int64)
+        values = np.concatenate([dense_values, sparse_values])
+        counts = np.concatenate([self._dense[dense_values], sparse_counts])
+        order = np.argsort(values, kind="stable")
+        return values[order], counts[order]
+
+    def pmf(self) -> tuple[np.ndarray, np.ndarray]:
+        """Empirical PMF: the distinct values seen and their frequencies"""
+        values, counts = self.values_and_counts()
+        return values, counts / self.count
+
+    def dense_counts(self, stop: int) -> np.ndarray:
+        """Counts of each of the values 0, 1, ..., stop - 1"""
+        counts = np.zeros(stop, dtype=np.int64)
+        head = self._dense[:stop]
+        counts[: head.size] = head
+        for value, count in self._sparse.items():
+            if 0 <= value < stop:
+                counts[value] += count
+        return counts
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values counted"""
+        if self.count == 0:
+            return math.nan
+        values, counts = self.values_and_counts()
+        return float(np.dot(values, counts) / self.count)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntegerHistogram):
+            return NotImplemented
+        return all(
+            np.array_equal(mine, theirs)
+            for mine, theirs in zip(
+                self.values_and_counts(), other.values_and_counts()
+            )
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"IntegerHistogram(count={self.count}, "
+            f"distinct_values={self.values_and_counts()[0].size})"
+        )
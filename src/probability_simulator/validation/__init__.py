@@ -1,3 +1,4 @@
+from .context import disabled as disabled, is_enabled as is_enabled
 from .fields import Field as Field, RealNumber as RealNumber
 from .interval import Interval as Interval
 from .functions import CallableField
@@ -9,4 +10,6 @@ __all__ = [
     "Interval",
     "CallableField",
     "RealNumberWithinInterval",
+    "disabled",
+    "is_enabled",
 ]
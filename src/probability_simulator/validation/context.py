@@ -0,0 +1,31 @@
+"""Switching Field validation off for trusted blocks of code"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_validation_enabled: ContextVar[bool] = ContextVar(
+    "validation_enabled", default=True
+)
+
+
+def is_enabled() -> bool:
+    """Whether Field descriptors validate assignments in this context"""
+    return _validation_enabled.get()
+
+
+@contextmanager
+def disabled() -> Iterator[None]:
+    """
+    Skip the Field preprocess/validate chain inside a `with` block.
+
+    Values are stored exactly as given, so only use this where they are
+    already known to be valid (e.g. a sweep over a validated grid).
+    The switch lives in a ContextVar: other threads and asyncio tasks
+    keep validating, and the previous state is restored on exit.
+    """
+    token = _validation_enabled.set(False)
+    try:
+        yield
+    finally:
+        _validation_enabled.reset(token)
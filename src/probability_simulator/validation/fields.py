@@ -1,7 +1,9 @@
 """Descriptors used for validating Fields"""
 
 from numbers import Real
-from typing import Any, Callable, Iterable
+from typing import Any, Callable, Iterable, Sequence
+
+from .context import is_enabled
 
 
 class Field:
@@ -58,11 +60,35 @@ class Field:
         return instance.__dict__.get(self.name)
 
     def __set__(self, instance, value) -> None:
-        """Set an instance attribute to value after validating"""
-        value = self.preprocess(value)
-        self.validate(value)
+        """Set an instance attribute to value after validating.
+        Validation is skipped inside a `validation.disabled()` block."""
+        if is_enabled():
+            value = self.preprocess(value)
+            self.validate(value)
+        instance.__dict__[self.name] = value
+
+    def set_unchecked(self, instance, value) -> None:
+        """Set an instance attribute without preprocessing or validating.
+        For trusted internal code paths where value is known to be valid."""
         instance.__dict__[self.name] = value
 
+    def set_many(
+        self, instances: Sequence[Any], values: Sequence[Any]
+    ) -> None:
+        """Validate values in bulk, then assign one to each instance.
+
+        All values are checked up front with validate_many(), so the
+        per-item preprocess/validate chain of __set__ is skipped.
+        """
+        if len(instances) != len(values):
+            raise ValueError(
+                f"Got {len(instances)} instances but {len(values)} values "
+                f"for {self.name}"
+            )
+        values = self.validate_many(values)
+        for instance, value in zip(instances, values):
+            self.set_unchecked(instance, value)
+
     def __delete__(self, instance):
         """Delete an attribute name from the instance dictionary"""
         if instance is None:
@@ -118,8 +144,48 @@ class Field:
         for validator in self.validators:
             validator(value, self.name)
 
+    def validate_many(self, values: Iterable[Any]) -> list[Any]:
+        """
+        Preprocess and validate every value, returning the processed values.
+
+        Rather than stopping at the first bad value, every TypeError or
+        ValueError is collected (with a note giving its index) and they are
+        all raised together as an ExceptionGroup.
+        """
+        results, errors = [], []
+        for index, value in enumerate(values):
+            try:
+                value = self.preprocess(value)
+                self.validate(value)
+            except (TypeError, ValueError) as error:
+                errors.append(self._note_index(error, index, value))
+            results.append(value)
+        self._raise_errors(errors)
+        return results
+
+    def _note_index(self, error: Exception, index: int, value: Any):
+        """Record which item of a bulk validation an error came from"""
+        error.add_note(f"{self.name}[{index}] = {value!r}")
+        return error
+
+    def _raise_errors(self, errors: list[Exception]) -> None:
+        """Raise every error from a bulk validation at once"""
+        if errors:
+            raise ExceptionGroup(
+                f"{len(errors)} invalid value(s) for {self.name}", errors
+            )
+
 
 class RealNumber(Field):
+    """
+    Descriptor for real numbers.
+
+    validate_many() checks numeric arrays in a single vectorized pass when
+    every validator has a `vectorized` attribute: a function taking an
+    array and returning a boolean mask of the valid entries, and there are
+    no preprocessors other than preprocess_str_to_real.
+    """
+
     @staticmethod
     def preprocess_str_to_real(val, name):
         """Attempt to convert a string to a real number. Returns the
@@ -152,3 +218,41 @@ class RealNumber(Field):
             validators=validators,
             preprocessors=preprocessors,
         )
+
+    def validate_many(self, values: Iterable[Any]) -> list[Any]:
+        """
+        Validate many real numbers at once. Numeric arrays (bool, int or
+        float dtypes) satisfy the type check as a whole, and are checked
+        against the vectorized form of each validator; only the failing
+        entries go back through validate() to build their error messages.
+        Anything else, or any field with preprocessors that could change a
+        number, falls back to the item-by-item Field.validate_many().
+        """
+        import numpy as np  # deferred: plain descriptors don't need NumPy
+
+        array = np.asarray(values)
+        if (
+            array.ndim != 1
+            or array.dtype.kind not in "biuf"
+            or not all(hasattr(v, "vectorized") for v in self.validators)
+            # preprocess_str_to_real leaves numbers alone, others may not
+            or any(
+                p is not RealNumber.preprocess_str_to_real
+                for p in self.preprocessors
+            )
+        ):
+            return super().validate_many(values)
+
+        valid = np.ones(array.shape, dtype=bool)
+        for validator in self.validators:
+            valid &= validator.vectorized(array)
+
+        results = array.tolist()
+        errors = []
+        for index in np.flatnonzero(~valid).tolist():
+            try:
+                self.validate(results[index])
+            except (TypeError, ValueError) as error:
+                errors.append(self._note_index(error, index, results[index]))
+        self._raise_errors(errors)
+        return results
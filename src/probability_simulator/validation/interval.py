@@ -1,8 +1,21 @@
-import re
+from functools import cache
 from .fields import RealNumber, Field
 from numbers import Real
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import re
+
+    import numpy as np
+
+
+@cache
+def _interval_pattern() -> "re.Pattern":
+    """Compile the interval regex on first use rather than at import"""
+    import re
+
+    return re.compile(r"^\s*([\(\[])\s*([^,]+)\s*,\s*([^,\]]+)\s*([\)\]])\s*$")
 
 
 class IntervalBracket(Enum):
@@ -58,11 +71,7 @@ class Interval:
             interval_string, str, "interval_string", allow_none=False
         )
         interval_string = interval_string.replace(" ", "")
-        pattern = re.compile(
-            r"^\s*([\(\[])\s*([^,]+)\s*,\s*([^,\]]+)\s*([\)\]])\s*$"
-        )
-
-        match = pattern.match(interval_string)
+        match = _interval_pattern().match(interval_string)
 
         if not match:
             raise ValueError(f"Invalid interval definition: {interval_string}")
@@ -108,6 +117,24 @@ class Interval:
 
         return True
 
+    def contains_many(self, values: Any) -> "np.ndarray":
+        """Vectorized `in`: return a boolean mask of the values inside the
+        interval. Bounds are compared exactly as in __contains__."""
+        import numpy as np  # deferred: plain descriptors don't need NumPy
+
+        values = np.asarray(values)
+        if self.left_bracket.is_closed:
+            inside = ~(values < self.lower)
+        else:
+            inside = ~(values <= self.lower)
+
+        if self.right_bracket.is_closed:
+            inside &= ~(values > self.upper)
+        else:
+            inside &= ~(values >= self.upper)
+
+        return inside
+
     def __repr__(self):
         return (
             f"{self.left_bracket.value}{self.lower}"
@@ -26,6 +26,8 @@ class RealNumberWithinInterval(RealNumber):
                     f"Instead, {name} = {value}",
                 )
 
+        validate_num_in_interval.vectorized = self.interval.contains_many
+
         super().__init__(
             validators=[validate_num_in_interval],
             preprocessors=[],
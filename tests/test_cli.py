@@ -0,0 +1,134 @@
+import json
+
+import numpy as np
+import pytest
+from probability_simulator.cli import ExperimentSpec, main, run_experiment
+
+
+@pytest.fixture
+def toml_spec(tmp_path):
+    path = tmp_path / "experiment.toml"
+    path.write_text(
+        'bias = 0.5\ntrial = "flips_until_heads"\nntrials = 20000\n'
+        "seed = 3\nchunk_size = 5000\n"
+    )
+    return path
+
+
+def test_main_writes_summary_and_results(toml_spec, tmp_path, capsys):
+    summary_path = tmp_path / "summary.json"
+    results_path = tmp_path / "results.npy"
+    exit_code = main(
+        [
+            str(toml_spec),
+            "--summary",
+            str(summary_path),
+            "--results",
+            str(results_path),
+        ]
+    )
+    assert exit_code == 0
+    summary = json.loads(summary_path.read_text())
+    results = np.load(results_path)
+    assert summary["engine"] == "vectorized"
+    assert summary["statistics"]["count"] == results.size == 20000
+    assert summary["statistics"]["mean"] == pytest.approx(results.mean())
+    assert summary["spec"]["seed"] == 3
+    # progress is streamed to stderr, one line per chunk
+    assert len(capsys.readouterr().err.splitlines()) == 4
+
+
+def test_main_prints_summary_from_json_spec(tmp_path, capsys):
+    path = tmp_path / "experiment.json"
+    path.write_text(
+        json.dumps(
+            {
+                "bias": 0.3,
+                "trial": "heads_in_n",
+                "trial_options": {"flips": 10},
+                "ntrials": 1000,
+                "rng": "sfc64",
+            }
+        )
+    )
+    assert main([str(path), "--quiet"]) == 0
+    output = capsys.readouterr()
+    assert output.err == ""
+    summary = json.loads(output.out)
+    assert summary["statistics"]["mean"] == pytest.approx(3, rel=0.1)
+    assert isinstance(summary["spec"]["seed"], int)
+
+
+def test_same_seed_gives_same_summary(toml_spec):
+    spec = ExperimentSpec.from_file(toml_spec)
+    first, _ = run_experiment(spec)
+    second, _ = run_experiment(spec)
+    assert first["statistics"] == second["statistics"]
+
+
+def test_precision_target_stops_early():
+    spec = ExperimentSpec(
+        ntrials=10**6, chunk_size=10**4, precision=0.05, seed=1
+    )
+    summary, results = run_experiment(spec, keep_results=True)
+    assert summary["precision_reached"] is True
+    assert summary["statistics"]["count"] == results.size == 10**4
+
+
+def test_multiple_workers_use_distributed_engine():
+    spec = ExperimentSpec(ntrials=4000, chunk_size=1000, workers=2, seed=8)
+    summary, results = run_experiment(spec)
+    assert summary["engine"] == "distributed"
+    assert summary["statistics"]["count"] == 4000
+    assert results is None
+    with pytest.raises(ValueError):
+        run_experiment(spec, keep_results=True)
+
+
+def test_multiple_workers_report_progress():
+    spec = ExperimentSpec(ntrials=4000, chunk_size=1000, workers=2, seed=8)
+    counts = []
+    summary, _ = run_experiment(
+        spec, progress=lambda stats: counts.append(stats.count)
+    )
+    # one report per shard, the last one covering every trial
+    assert counts == [1000, 2000, 3000, 4000]
+    assert summary["statistics"]["count"] == 4000
+
+
+def test_precision_needs_a_single_worker(tmp_path, capsys):
+    with pytest.raises(ValueError, match="single worker"):
+        ExperimentSpec(workers=2, precision=0.01)
+    path = tmp_path / "experiment.json"
+    path.write_text(json.dumps({"workers": 2, "precision": 0.01}))
+    assert main([str(path)]) == 2
+    assert "single worker" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"bias": 2},
+        {"trial": "roll_a_die"},
+        {"ntrials": 0},
+        {"rng": "not-a-generator"},
+        {"precision": -1.0},
+        {"colour": "red"},
+    ],
+)
+def test_invalid_spec(settings):
+    with pytest.raises((TypeError, ValueError)):
+        ExperimentSpec.from_dict(settings)
+
+
+def test_main_reports_invalid_spec(tmp_path, capsys):
+    path = tmp_path / "experiment.toml"
+    path.write_text("bias = 2\n")
+    assert main([str(path)]) == 2
+    assert "error" in capsys.readouterr().err
+
+
+def test_main_rejects_unknown_file_type(tmp_path):
+    path = tmp_path / "experiment.yaml"
+    path.write_text("bias: 0.5\n")
+    assert main([str(path)]) == 2
@@ -1,6 +1,13 @@
 import numpy as np
 import pytest
-from probability_simulator.coin_flips import Coin
+from probability_simulator.coin_flips import (
+    Coin,
+    CoinExperiment,
+    columns,
+    trial_schema,
+)
+from probability_simulator.random_walks import MarkovCoin
+from probability_simulator.stats import IntegerHistogram, RunningStats
 
 
 @pytest.fixture
@@ -57,3 +64,207 @@ def test_invalid_bias_value():
 
 def test_integer_is_valid_bias_type():
     Coin(bias=1)
+
+
+def test_coins_from_biases():
+    rng = np.random.default_rng(seed=1)
+    coins = Coin.from_biases(np.array([0.1, 0.5, 1]), rng=rng)
+    assert [coin.bias for coin in coins] == [0.1, 0.5, 1]
+    assert all(coin.rng is rng for coin in coins)
+    assert coins[2].flip() == 1
+
+
+def test_coins_from_biases_share_a_named_backend():
+    coins = Coin.from_biases([0.2, 0.7], rng="sfc64")
+    assert coins[0].rng is coins[1].rng
+    assert isinstance(coins[0].rng.bit_generator, np.random.SFC64)
+
+
+def test_coins_from_biases_reports_every_invalid_bias():
+    with pytest.raises(ExceptionGroup) as excinfo:
+        Coin.from_biases([0.5, -1, 2, "abc"])
+    assert len(excinfo.value.exceptions) == 3
+
+
+def test_accumulate_trials_builds_histogram():
+    coin = Coin(bias=0.5, rng=np.random.default_rng(seed=3))
+    experiment = CoinExperiment(coin, ntrials=2500)
+    flips_until_head = CoinExperiment.flips_until(lambda flip: flip == 1)
+    histogram = experiment.accumulate_trials(flips_until_head, chunk_size=1000)
+    assert isinstance(histogram, IntegerHistogram)
+    assert histogram.count == 2500
+    assert histogram.mean == pytest.approx(2, rel=0.1)
+
+
+def test_accumulate_trials_matches_run_trials():
+    flips_until_head = CoinExperiment.flips_until(lambda flip: flip == 1)
+    results = CoinExperiment.create_seeded_experiment(
+        Coin(0.3), ntrials=500, seed=1
+    ).run_trials(flips_until_head)
+    stats = CoinExperiment.create_seeded_experiment(
+        Coin(0.3), ntrials=500, seed=1
+    ).accumulate_trials(flips_until_head, RunningStats(), chunk_size=64)
+    assert stats.count == 500
+    assert stats.mean == pytest.approx(results.mean())
+
+
+def test_accumulate_trials_invalid_chunk_size(fair_coin):
+    with pytest.raises(ValueError):
+        CoinExperiment(fair_coin).accumulate_trials(Coin.flip, chunk_size=0)
+
+
+def heads_in_ten_flips(coin: Coin) -> int:
+    return int(coin.flip_n(10).sum())
+
+
+@pytest.fixture
+def keyed_experiment():
+    return CoinExperiment.create_keyed_experiment(
+        Coin(0.5), ntrials=200, seed=12
+    )
+
+
+def test_keyed_experiment_is_reproducible(keyed_experiment):
+    other = CoinExperiment.create_keyed_experiment(
+        Coin(0.5), ntrials=200, seed=12
+    )
+    assert np.array_equal(
+        keyed_experiment.run_trials(heads_in_ten_flips),
+        other.run_trials(heads_in_ten_flips),
+    )
+
+
+def test_keyed_experiment_replays_any_trial(keyed_experiment):
+    results = keyed_experiment.run_trials(heads_in_ten_flips)
+    for index in [0, 1, 57, 199]:
+        replayed = keyed_experiment.replay_trial(heads_in_ten_flips, index)
+        assert replayed == results[index]
+
+
+def test_trial_ranges_stay_within_ntrials():
+    experiment = CoinExperiment.create_keyed_experiment(Coin(), ntrials=5)
+    with pytest.raises(ValueError):
+        experiment.run_trials(heads_in_ten_flips, 0, 50)
+    for index in (5, 100, -1):
+        with pytest.raises(ValueError):
+            experiment.replay_trial(heads_in_ten_flips, index)
+
+
+def test_keyed_experiment_ranges_in_any_order(keyed_experiment):
+    results = keyed_experiment.run_trials(heads_in_ten_flips)
+    pieces = {
+        start: keyed_experiment.run_trials(heads_in_ten_flips, start, stop)
+        for start, stop in [(150, 200), (0, 70), (70, 150)]
+    }
+    assert np.array_equal(
+        np.concatenate([pieces[0], pieces[70], pieces[150]]), results
+    )
+
+
+def test_keyed_experiment_restores_coin_rng(keyed_experiment):
+    rng = keyed_experiment.coin.rng
+    keyed_experiment.run_trials(heads_in_ten_flips)
+    assert keyed_experiment.coin.rng is rng
+
+
+def test_keyed_experiment_resets_coin_state_per_trial():
+    experiment = CoinExperiment.create_keyed_experiment(
+        MarkovCoin(0.99, 0.01), ntrials=50, seed=3
+    )
+    results = experiment.run_trials(heads_in_ten_flips)
+    np.testing.assert_array_equal(
+        experiment.run_trials(heads_in_ten_flips), results
+    )
+    for index in (0, 17, 49):
+        replayed = experiment.replay_trial(heads_in_ten_flips, index)
+        assert replayed == results[index]
+    assert experiment.coin.last_flip is None
+
+
+def test_keyed_experiment_accumulates_same_results(keyed_experiment):
+    results = keyed_experiment.run_trials(heads_in_ten_flips)
+    histogram = keyed_experiment.accumulate_trials(
+        heads_in_ten_flips, chunk_size=33
+    )
+    expected = IntegerHistogram()
+    expected.update(results)
+    assert histogram == expected
+
+
+def test_replay_needs_keyed_experiment(fair_coin):
+    with pytest.raises(ValueError):
+        CoinExperiment(fair_coin).replay_trial(heads_in_ten_flips, 3)
+
+
+@pytest.mark.parametrize("start, stop", [(-1, 5), (5, 3), (0.5, 3)])
+def test_run_trials_invalid_range(fair_coin, start, stop):
+    with pytest.raises((TypeError, ValueError)):
+        CoinExperiment(fair_coin).run_trials(heads_in_ten_flips, start, stop)
+
+
+@trial_schema(flips=np.int64, heads=np.int64)
+def flips_until_two_heads(coin: Coin):
+    flips = heads = 0
+    while heads < 2:
+        flips += 1
+        heads += coin.flip()
+    return flips, heads
+
+
+@trial_schema(flips=np.int64, first=np.bool_)
+def first_flip_as_dict(coin: Coin):
+    return {"first": bool(coin.flip()), "flips": 1}
+
+
+def test_trial_schema_gives_structured_results():
+    experiment = CoinExperiment.create_seeded_experiment(
+        Coin(0.5), ntrials=300, seed=2
+    )
+    results = experiment.run_trials(flips_until_two_heads)
+    assert results.dtype == np.dtype(
+        [("flips", np.int64), ("heads", np.int64)]
+    )
+    assert results.shape == (300,)
+    result_columns = columns(results)
+    assert (result_columns["heads"] == 2).all()
+    assert (result_columns["flips"] >= 2).all()
+
+
+def test_trial_schema_accepts_dict_results(fair_coin):
+    results = CoinExperiment(fair_coin, ntrials=20).run_trials(
+        first_flip_as_dict
+    )
+    assert results["flips"].tolist() == [1] * 20
+    assert results["first"].dtype == np.bool_
+
+
+def test_trial_schema_matches_untyped_results():
+    untyped = CoinExperiment.create_seeded_experiment(
+        Coin(0.3), ntrials=100, seed=5
+    ).run_trials(lambda coin: coin.flip())
+    typed = CoinExperiment.create_seeded_experiment(
+        Coin(0.3), ntrials=100, seed=5
+    ).run_trials(trial_schema(np.int8)(lambda coin: coin.flip()))
+    assert typed.dtype == np.int8
+    assert np.array_equal(typed, untyped)
+
+
+def test_flips_until_has_typed_results(fair_coin):
+    flips_until_head = CoinExperiment.flips_until(lambda flip: flip == 1)
+    results = CoinExperiment(fair_coin, ntrials=10).run_trials(
+        flips_until_head
+    )
+    assert results.dtype == np.int64
+
+
+@pytest.mark.parametrize(
+    "args, kwargs", [((), {}), ((np.int64,), {"flips": np.int64})]
+)
+def test_trial_schema_needs_dtype_or_fields(args, kwargs):
+    with pytest.raises(ValueError):
+        trial_schema(*args, **kwargs)
+
+
+def test_columns_needs_named_fields():
+    with pytest.raises(ValueError):
+        columns(np.arange(3))
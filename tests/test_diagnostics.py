@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+import pytest
+from probability_simulator.diagnostics import (
+    ConvergenceTracker,
+    convergence_diagnostics,
+    log_checkpoints,
+    pmf_distances,
+)
+
+
+@pytest.fixture
+def geometric_results():
+    """Flips until the first head of a fair coin"""
+    return np.random.default_rng(seed=8).geometric(0.5, size=100_000)
+
+
+@pytest.fixture
+def geometric_pmf():
+    """P(X = k) = 1/2^k for k >= 1, truncated at k = 40"""
+    return np.concatenate([[0], 0.5 ** np.arange(1, 41)])
+
+
+def test_log_checkpoints():
+    checkpoints = log_checkpoints(1000, per_decade=1)
+    assert checkpoints.tolist() == [1, 10, 100, 1000]
+    assert log_checkpoints(1234)[-1] == 1234
+    assert np.all(np.diff(log_checkpoints(10**6)) > 0)
+
+
+def test_running_mean_matches_prefix_means(geometric_results):
+    result = convergence_diagnostics(geometric_results)
+    prefix_means = np.cumsum(geometric_results) / np.arange(
+        1, geometric_results.size + 1
+    )
+    assert result.checkpoints[-1] == geometric_results.size
+    assert np.allclose(result.mean, prefix_means[result.checkpoints - 1])
+
+
+def test_stderr_matches_numpy(geometric_results):
+    result = convergence_diagnostics(geometric_results, checkpoints=[500])
+    expected = np.std(geometric_results[:500], ddof=1) / math.sqrt(500)
+    assert result.stderr[0] == pytest.approx(expected)
+
+
+def test_stream_matches_array(geometric_results):
+    """Chunk boundaries don't change the diagnostics"""
+    checkpoints = log_checkpoints(geometric_results.size)
+    whole = convergence_diagnostics(geometric_results, checkpoints)
+    chunks = np.array_split(geometric_results, 37)
+    streamed = convergence_diagnostics(iter(chunks), checkpoints)
+    assert np.array_equal(whole.checkpoints, streamed.checkpoints)
+    assert np.allclose(whole.mean, streamed.mean)
+    assert np.allclose(
+        whole.batch_stderr, streamed.batch_stderr, equal_nan=True
+    )
+
+
+def test_list_matches_array(geometric_results):
+    whole = convergence_diagnostics(geometric_results)
+    from_list = convergence_diagnostics(geometric_results.tolist())
+    assert np.array_equal(whole.checkpoints, from_list.checkpoints)
+    assert np.allclose(whole.mean, from_list.mean)
+
+
+def test_stream_of_unknown_length_reports_final_count():
+    chunks = (np.ones(7, dtype=int) for _ in range(3))
+    result = convergence_diagnostics(chunks)
+    assert result.checkpoints.tolist() == [
+        1,
+        2,
+        3,
+        4,
+        5,
+        6,
+        8,
+        10,
+        13,
+        16,
+        20,
+        21,
+    ]
+
+
+def test_batch_stderr_agrees_for_independent_trials(geometric_results):
+    result = convergence_diagnostics(geometric_results)
+    assert result.batch_stderr[-1] == pytest.approx(result.stderr[-1], rel=0.3)
+
+
+def test_batch_stderr_detects_correlation():
+    """Batch means see the extra variance of positively correlated trials"""
+    rng = np.random.default_rng(seed=2)
+    correlated = np.repeat(rng.normal(size=10_000), 50)
+    result = convergence_diagnostics(correlated)
+    assert result.batch_stderr[-1] > 3 * result.stderr[-1]
+
+
+def test_z_score(geometric_results):
+    result = convergence_diagnostics(geometric_results, theoretical_mean=2)
+    assert abs(result.z_score[-1]) < 4
+    wrong = convergence_diagnostics(geometric_results, theoretical_mean=2.1)
+    assert abs(wrong.z_score[-1]) > 4
+
+
+def test_pmf_distances_shrink(geometric_results, geometric_pmf):
+    result = convergence_diagnostics(
+        geometric_results, theoretical_pmf=geometric_pmf
+    )
+    assert result.total_variation[-1] < 0.01
+    assert result.ks[-1] < result.total_variation[-1] + 1e-12
+    assert result.total_variation[-1] < result.total_variation[5]
+    # roughly chi-square distributed with ~ 20 degrees of freedom
+    assert result.chi_square[-1] < 100
+
+
+def test_pmf_distances_of_exact_counts():
+    total_variation, ks, chi_square = pmf_distances(
+        np.array([25, 50, 25]), np.array([0.25, 0.5, 0.25])
+    )
+    assert (total_variation, ks, chi_square) == (0, 0, 0)
+
+
+def test_pmf_distances_outside_support():
+    total_variation, ks, chi_square = pmf_distances(
+        np.array([0, 10]), np.array([1.0])
+    )
+    assert total_variation == pytest.approx(1)
+    assert ks == pytest.approx(1)
+    assert chi_square == math.inf
+
+
+def test_pmf_requires_non_negative_integers(geometric_pmf):
+    tracker = ConvergenceTracker(theoretical_pmf=geometric_pmf)
+    with pytest.raises(ValueError):
+        tracker.update(np.array([0.5, 1.5]))
+    with pytest.raises(ValueError):
+        tracker.update(np.array([-1, 2]))
+
+
+def test_invalid_nbatches():
+    with pytest.raises(ValueError):
+        ConvergenceTracker(nbatches=1)
+
+
+def test_tracker_without_results():
+    result = ConvergenceTracker().diagnostics()
+    assert result.checkpoints.size == 0
@@ -0,0 +1,166 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin, CoinExperiment
+from probability_simulator.distributed import (
+    KeyedTrialTask,
+    ShardCoordinator,
+    TrialTask,
+)
+from probability_simulator.random_walks import MarkovCoin
+
+
+def heads(coin: Coin) -> int:
+    """Picklable trial function: flip the coin once"""
+    return coin.flip()
+
+
+def repeats(coin: Coin) -> int:
+    """Picklable trial function: flips until the outcome changes"""
+    first, count = coin.flip(), 1
+    while coin.flip() == first:
+        count += 1
+    return count
+
+
+class FailFirstAttempt:
+    """Task that fails the first time shard 1 is run.
+
+    A marker file records the failure, since the retry may happen in a
+    different worker process.
+    """
+
+    def __init__(self, task, marker: Path, crash: bool = False):
+        self.task = task
+        self.marker = marker
+        self.crash = crash
+
+    def __call__(self, shard):
+        if shard.index == 1 and not self.marker.exists():
+            self.marker.touch()
+            if self.crash:
+                os._exit(1)
+            raise RuntimeError("flaky worker")
+        return self.task(shard)
+
+
+class AlwaysFail:
+    def __call__(self, shard):
+        raise RuntimeError("broken task")
+
+
+@pytest.fixture
+def task():
+    return TrialTask(Coin(0.3), heads)
+
+
+def test_shards_cover_all_trials():
+    coordinator = ShardCoordinator(ntrials=2500, shard_size=1000, seed=1)
+    assert [shard.ntrials for shard in coordinator.shards] == [1000, 1000, 500]
+    assert [shard.index for shard in coordinator.shards] == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"ntrials": 0},
+        {"ntrials": 10, "shard_size": 0},
+        {"ntrials": 10, "max_retries": -1},
+    ],
+)
+def test_invalid_coordinator_arguments(kwargs):
+    with pytest.raises(ValueError):
+        ShardCoordinator(**kwargs)
+
+
+def test_unseeded_coordinator_records_seed(task):
+    coordinator = ShardCoordinator(ntrials=300, shard_size=100)
+    seeded = ShardCoordinator(300, 100, seed=coordinator.seed)
+    assert coordinator.run_serial(task) == seeded.run_serial(task)
+
+
+def test_serial_run_matches_bias(task):
+    stats = ShardCoordinator(20000, 5000, seed=2).run_serial(task)
+    assert stats.count == 20000
+    assert stats.mean == pytest.approx(0.3, abs=0.015)
+
+
+def test_local_run_matches_serial_run(task):
+    coordinator = ShardCoordinator(ntrials=4000, shard_size=500, seed=5)
+    serial = coordinator.run_serial(task)
+    assert coordinator.run_local(task, nworkers=1, timeout=30) == serial
+    assert coordinator.run_local(task, nworkers=3, timeout=30) == serial
+
+
+@pytest.mark.parametrize("crash", [False, True])
+def test_failed_shard_is_retried(task, tmp_path, crash):
+    coordinator = ShardCoordinator(ntrials=2000, shard_size=500, seed=5)
+    flaky = FailFirstAttempt(task, tmp_path / "failed", crash=crash)
+    result = coordinator.run_local(flaky, nworkers=2, timeout=30)
+    assert (tmp_path / "failed").exists()
+    assert result == coordinator.run_serial(task)
+
+
+def test_shard_failing_every_attempt_raises():
+    coordinator = ShardCoordinator(1000, 500, seed=5, max_retries=1)
+    with pytest.raises(RuntimeError, match="broken task"):
+        coordinator.run_local(AlwaysFail(), nworkers=1, timeout=30)
+
+
+def test_experiment_run_distributed():
+    experiment = CoinExperiment(Coin(0.8), ntrials=3000)
+    stats = experiment.run_distributed(
+        heads, nworkers=2, shard_size=1000, seed=9, timeout=30
+    )
+    expected = ShardCoordinator(3000, 1000, seed=9).run_serial(
+        TrialTask(Coin(0.8), heads)
+    )
+    assert stats == expected
+
+
+def test_keyed_task_is_independent_of_shard_size():
+    task = KeyedTrialTask(Coin(0.4), heads, seed=21)
+    small = ShardCoordinator(3000, 250, seed=1).run_serial(task)
+    large = ShardCoordinator(3000, 1000, seed=2).run_serial(task)
+    assert small.count == large.count == 3000
+    assert small.mean == pytest.approx(large.mean, rel=1e-12)
+    assert small.variance == pytest.approx(large.variance, rel=1e-12)
+
+
+def test_experiment_run_distributed_keyed():
+    experiment = CoinExperiment(Coin(0.4), ntrials=2000)
+    stats = experiment.run_distributed(
+        heads, shard_size=700, seed=4, timeout=30, keyed=True
+    )
+    results = CoinExperiment.create_keyed_experiment(
+        Coin(0.4), ntrials=2000, seed=4
+    ).run_trials(heads)
+    assert stats.mean == pytest.approx(results.mean(), rel=1e-12)
+
+
+def test_run_distributed_keeps_markov_coin():
+    coin = MarkovCoin(0.95, 0.05, rng=np.random.default_rng(seed=5))
+    experiment = CoinExperiment(coin, ntrials=4000)
+    stats = experiment.run_distributed(
+        repeats, shard_size=1000, seed=6, timeout=30
+    )
+    # a run of repeats lasts 1 / 0.05 = 20 flips on average
+    assert stats.mean == pytest.approx(20, rel=0.1)
+    assert stats.mean == pytest.approx(
+        experiment.run_trials(repeats).mean(), rel=0.1
+    )
+
+
+def test_keyed_task_keeps_markov_coin():
+    task = KeyedTrialTask(MarkovCoin(0.95, 0.05), repeats, seed=7)
+    stats = ShardCoordinator(2000, 500, seed=1).run_serial(task)
+    assert stats.mean == pytest.approx(20, rel=0.1)
+
+
+def test_unpicklable_trial_function_is_rejected_up_front():
+    experiment = CoinExperiment(Coin(0.5), ntrials=100)
+    closure = CoinExperiment.flips_until(lambda flip: flip == 1)
+    with pytest.raises(TypeError, match="picklable"):
+        experiment.run_distributed(closure, shard_size=10, timeout=30)
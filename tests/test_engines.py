@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin
+from probability_simulator.engines import (
+    SAMPLERS,
+    flips_until,
+    heads_in_n,
+    reference_trial,
+)
+from probability_simulator.random_walks import MarkovCoin
+
+
+@pytest.fixture
+def seeded_coin():
+    return Coin(0.25, rng=np.random.default_rng(seed=6))
+
+
+def test_flips_until_heads_mean(seeded_coin):
+    counts = flips_until(seeded_coin, 100_000)
+    assert counts.dtype == np.int64
+    assert counts.min() >= 1
+    assert counts.mean() == pytest.approx(4, rel=0.02)
+
+
+def test_flips_until_tails_mean(seeded_coin):
+    counts = SAMPLERS["flips_until_tails"](seeded_coin, 100_000)
+    assert counts.mean() == pytest.approx(4 / 3, rel=0.02)
+
+
+def test_flips_until_certain_outcome():
+    assert (flips_until(Coin(1), 50) == 1).all()
+
+
+def test_flips_until_impossible_outcome():
+    with pytest.raises(ValueError):
+        flips_until(Coin(0), 10)
+
+
+def test_flips_until_stuck_markov_coin():
+    # once tails, always tails: trials that start with tails never end
+    with pytest.raises(ValueError):
+        flips_until(MarkovCoin(0.5, 0, bias=0.5), 10)
+
+
+def test_flips_until_invalid_outcome(seeded_coin):
+    with pytest.raises(ValueError):
+        flips_until(seeded_coin, 10, outcome=2)
+
+
+def test_heads_in_n(seeded_coin):
+    counts = heads_in_n(seeded_coin, 50_000, flips=8)
+    assert counts.min() >= 0 and counts.max() <= 8
+    assert counts.mean() == pytest.approx(2, rel=0.02)
+
+
+@pytest.mark.parametrize("ntrials", [0, 1, 7])
+@pytest.mark.parametrize("name", SAMPLERS)
+def test_samplers_return_one_result_per_trial(seeded_coin, name, ntrials):
+    assert SAMPLERS[name](seeded_coin, ntrials).shape == (ntrials,)
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+def test_reference_trials_exist(seeded_coin, name):
+    assert reference_trial(name)(seeded_coin) >= 0
+
+
+def test_unknown_reference_trial():
+    with pytest.raises(ValueError):
+        reference_trial("roll_a_die")
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin
+from probability_simulator.games import MultiCoinExperiment, penney_tournament
+from probability_simulator.random_walks import MarkovCoin
+
+
+@pytest.fixture
+def seeded_rng():
+    return np.random.default_rng(seed=11)
+
+
+def test_race_to_one_head(seeded_rng):
+    coins = [Coin(0.5, rng=seeded_rng), Coin(0.5)]
+    result = MultiCoinExperiment(coins, ntrials=50_000).race()
+    assert result.finished.all()
+    # each round: one head wins with prob 1/2, both heads tie with prob 1/4
+    assert result.win_probabilities() == pytest.approx(
+        [1 / 3, 1 / 3], abs=0.01
+    )
+    assert result.ties.mean() == pytest.approx(1 / 3, abs=0.01)
+    assert result.times.mean() == pytest.approx(4 / 3, rel=0.02)
+
+
+def test_race_certain_coin_always_wins(seeded_rng):
+    coins = [Coin(0.2, rng=seeded_rng), Coin(1), Coin(0)]
+    result = MultiCoinExperiment(coins, ntrials=1000).race(target_heads=3)
+    assert (result.times <= 3).all()
+    # the first coin can only tie by getting heads three times out of three
+    assert ((result.winners == 1) | result.ties).all()
+
+
+def test_race_gives_up_after_max_rounds(seeded_rng):
+    coins = [Coin(0.01, rng=seeded_rng), Coin(0.01)]
+    result = MultiCoinExperiment(coins, ntrials=1000).race(
+        target_heads=5, max_rounds=3
+    )
+    assert not result.finished.any()
+    assert (result.winners == -1).all()
+
+
+def test_race_needs_a_coin_that_can_land_heads():
+    with pytest.raises(ValueError):
+        MultiCoinExperiment([Coin(0), Coin(0)], ntrials=10).race()
+
+
+def test_pattern_race_hh_against_ht(seeded_rng):
+    coins = [Coin(0.5, rng=seeded_rng), Coin(0.5)]
+    result = MultiCoinExperiment(coins, ntrials=50_000).pattern_race(
+        ["HH", "HT"]
+    )
+    assert result.finished.all()
+    wins = result.win_probabilities()
+    # HT takes 4 flips on average, HH takes 6
+    assert wins[1] > wins[0] + 0.15
+    assert wins.sum() + result.ties.mean() == pytest.approx(1)
+
+
+def test_pattern_race_patterns_longer_than_a_block(seeded_rng):
+    coins = [Coin(1, rng=seeded_rng), Coin(0)]
+    result = MultiCoinExperiment(coins, ntrials=10).pattern_race(
+        ["H" * 40, "T" * 41]
+    )
+    assert (result.winners == 0).all()
+    assert (result.times == 40).all()
+
+
+@pytest.mark.parametrize("patterns", [["HH"], ["HH", "HX"], ["HH", ""]])
+def test_pattern_race_invalid_patterns(patterns):
+    experiment = MultiCoinExperiment([Coin(), Coin()], ntrials=10)
+    with pytest.raises(ValueError):
+        experiment.pattern_race(patterns)
+
+
+def test_multi_coin_experiment_validation():
+    with pytest.raises(ValueError):
+        MultiCoinExperiment([Coin()])
+    with pytest.raises(TypeError):
+        MultiCoinExperiment([Coin(), 0.5])
+    with pytest.raises(ValueError):
+        MultiCoinExperiment([Coin(), MarkovCoin()])
+    with pytest.raises(TypeError):
+        MultiCoinExperiment([Coin(), Coin()], ntrials=1.5)
+
+
+def test_penney_tournament(seeded_rng):
+    coin = Coin(0.5, rng=seeded_rng)
+    tournament = penney_tournament(coin, ["HHT", "THH", "HTH"], 50_000)
+    assert tournament.times.shape == (50_000, 3)
+    assert (tournament.times >= 3).all()
+    wins = tournament.win_matrix()
+    # THH beats HHT unless the first two flips are heads
+    assert wins[1, 0] == pytest.approx(3 / 4, abs=0.01)
+    assert wins[0, 1] + wins[1, 0] == pytest.approx(1)
+    assert np.diag(wins) == pytest.approx(0)
+    assert tournament.times.mean(axis=0) == pytest.approx([8, 8, 10], rel=0.03)
+
+
+def test_penney_tournament_draws_when_one_pattern_ends_another(seeded_rng):
+    coin = Coin(0.5, rng=seeded_rng)
+    tournament = penney_tournament(coin, ["HT", "T"], 20_000)
+    draws = tournament.draw_matrix()
+    # HT and T first appear together when the first tails follows a head
+    assert draws[0, 1] == pytest.approx(1 / 2, abs=0.02)
+    assert np.diag(draws) == pytest.approx(1)
+
+
+def test_penney_tournament_with_markov_coin():
+    coin = MarkovCoin(p_heads_after_heads=0, p_heads_after_tails=1, bias=1)
+    # the coin alternates HTHT..., so TT never appears
+    tournament = penney_tournament(coin, ["HTH", "TT"], 100, max_flips=50)
+    assert (tournament.times[:, 0] == 3).all()
+    assert (tournament.times[:, 1] == -1).all()
+    assert tournament.win_matrix()[0, 1] == 1
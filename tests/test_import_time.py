@@ -0,0 +1,96 @@
+"""Tests that importing the package stays cheap"""
+
+import subprocess
+import sys
+
+import pytest
+
+# stdlib module whose import time the budgets are relative to, so they
+# hold on slow and fast machines alike
+BASELINE_MODULE = "json"
+
+# cumulative import time budgets, as multiples of importing the baseline:
+# about twice the measured ratios (~0.25 and ~2), so that a new eager
+# import of a module like typing or re fails rather than only NumPy
+IMPORT_BUDGETS = {
+    "probability_simulator": 0.5,
+    "probability_simulator.validation": 3.5,
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import module in a fresh interpreter with `-X importtime` and return
+    the cumulative import time (in microseconds) of every module loaded"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_import_time(module: str, repeat: int = 3) -> int:
+    """Shortest cumulative import time of module over a few fresh
+    interpreters, in microseconds"""
+    import_times(module)  # warm up the bytecode cache
+    return min(import_times(module)[module] for _ in range(repeat))
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS)
+def test_import_does_not_load_numpy(module):
+    assert "numpy" not in import_times(module)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("module, budget", IMPORT_BUDGETS.items())
+def test_import_time_budget(module, budget):
+    baseline = best_import_time(BASELINE_MODULE)
+    assert best_import_time(module) < budget * baseline
+
+
+def test_lazy_attributes_are_loaded_on_access():
+    code = (
+        "import sys, probability_simulator as ps;"
+        "assert 'probability_simulator.coin_flips' not in sys.modules;"
+        "ps.Coin;"
+        "assert 'probability_simulator.coin_flips' in sys.modules;"
+        "assert 'numpy' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize("submodule", ["coin_flips", "validation", "games"])
+def test_submodules_are_loaded_on_access(submodule):
+    code = (
+        "import sys, probability_simulator as ps;"
+        f"assert 'probability_simulator.{submodule}' not in sys.modules;"
+        f"module = ps.{submodule};"
+        f"assert module is sys.modules['probability_simulator.{submodule}']"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_attribute_raises():
+    import probability_simulator
+
+    with pytest.raises(AttributeError):
+        probability_simulator.NotAClass
+
+
+def test_import_does_not_load_typing():
+    assert "typing" not in import_times("probability_simulator")
+
+
+def test_dir_lists_lazy_attributes():
+    import probability_simulator
+
+    assert set(probability_simulator.__all__) <= set(
+        dir(probability_simulator)
+    )
@@ -0,0 +1,122 @@
+"""Performance guardrails: throughput floors and allocation limits.
+
+Timings are compared with a baseline NumPy operation measured in the same
+process, so the budgets are ratios that hold on slow and fast machines
+alike. Run only these with `pytest -m performance`, or skip them with
+`pytest -m "not performance"`.
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin, CoinExperiment
+from probability_simulator.diagnostics import convergence_diagnostics
+from probability_simulator.engines import SAMPLERS, reference_trial
+from probability_simulator.rng import make_rng
+
+pytestmark = pytest.mark.performance
+
+
+def best_time(function, repeat: int = 5) -> float:
+    """Shortest wall time of a few calls of function"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def traced_memory(function) -> tuple[int, int]:
+    """Bytes still allocated after calling function, and the peak number
+    of bytes allocated during the call"""
+    function()  # warm up caches so only the steady state is measured
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current - before, peak - before
+
+
+@pytest.fixture
+def seeded_coin():
+    return Coin(0.5, rng=np.random.default_rng(seed=2))
+
+
+def test_flip_n_throughput(seeded_coin):
+    n = 10**7
+    rng = np.random.default_rng(seed=3)
+    baseline = best_time(lambda: rng.random(n) < 0.5)
+    assert best_time(lambda: seeded_coin.flip_n(n)) < 4 * baseline
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+def test_samplers_beat_scalar_trials(seeded_coin, name):
+    ntrials = 5000
+    experiment = CoinExperiment(seeded_coin, ntrials)
+    trial = reference_trial(name)
+    scalar = best_time(lambda: experiment.run_trials(trial), repeat=1)
+    sampler = best_time(lambda: SAMPLERS[name](seeded_coin, ntrials))
+    assert sampler * 5 < scalar
+
+
+def test_convergence_diagnostics_of_a_list_is_vectorized():
+    results = np.random.default_rng(seed=4).geometric(0.3, 10**5)
+    as_list = results.tolist()
+    array_time = best_time(lambda: convergence_diagnostics(results))
+    # the list is converted once, not consumed one value per chunk
+    assert best_time(lambda: convergence_diagnostics(as_list)) < (
+        5 * array_time + 0.05
+    )
+
+
+def test_keyed_trials_overhead():
+    ntrials = 20_000
+    trial = CoinExperiment.flips_until(lambda flip: flip == 1)
+    seeded = CoinExperiment(Coin(0.5, rng=make_rng("philox", 1)), ntrials)
+    keyed = CoinExperiment.create_keyed_experiment(Coin(0.5), ntrials)
+    seeded_time = best_time(lambda: seeded.run_trials(trial), repeat=3)
+    # moving to each trial's stream costs about as much as a short trial
+    assert best_time(lambda: keyed.run_trials(trial), repeat=3) < (
+        3.5 * seeded_time
+    )
+
+
+def test_field_set_does_not_allocate(seeded_coin):
+    def set_bias():
+        for _ in range(10_000):
+            seeded_coin.bias = 0.25
+
+    retained, peak = traced_memory(set_bias)
+    # a few bytes of bookkeeping at most, nothing per call
+    assert retained < 4096
+    assert peak < 4096
+
+
+def test_run_trials_with_schema_allocates_only_the_results(seeded_coin):
+    ntrials = 100_000
+    experiment = CoinExperiment(seeded_coin, ntrials)
+    trial = CoinExperiment.flips_until(lambda flip: flip == 1)
+    results_bytes = ntrials * np.dtype(np.int64).itemsize
+
+    retained, peak = traced_memory(lambda: experiment.run_trials(trial))
+    assert retained < 4096  # the results are freed on return
+    assert peak < results_bytes + 64 * 1024
+
+
+def test_accumulate_trials_memory_is_bounded_by_chunk(seeded_coin):
+    chunk_size = 10_000
+    experiment = CoinExperiment(seeded_coin, 20 * chunk_size)
+    trial = CoinExperiment.flips_until(lambda flip: flip == 1)
+
+    retained, peak = traced_memory(
+        lambda: experiment.accumulate_trials(trial, chunk_size=chunk_size)
+    )
+    assert retained < 4096
+    # one chunk of results and its bincount, whatever ntrials is
+    assert peak < 4 * chunk_size * np.dtype(np.int64).itemsize + 64 * 1024
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin
+from probability_simulator.random_walks import MarkovCoin, RandomWalk
+
+
+@pytest.fixture
+def seeded_fair_coin():
+    """Fixture for a fair coin with a seeded RNG"""
+    return Coin(bias=0.5, rng=np.random.default_rng(seed=7))
+
+
+def test_markov_coin_flip_n_is_array_of_1s_and_0s():
+    coin = MarkovCoin(0.9, 0.1, rng=np.random.default_rng(seed=1))
+    result = coin.flip_n(50)
+    assert result.shape == (50,)
+    assert set(np.unique(result)) <= {0, 1}
+
+
+def test_markov_coin_flip_remembers_last_flip():
+    coin = MarkovCoin(p_heads_after_heads=1, p_heads_after_tails=1, bias=0)
+    assert coin.flip() == 0
+    assert coin.flip() == 1
+    assert all(coin.flip_n(10) == 1)
+
+
+def test_markov_coins_from_biases():
+    coins = MarkovCoin.from_biases([0.2, 0.3])
+    assert all(isinstance(coin, MarkovCoin) for coin in coins)
+    assert [coin.bias for coin in coins] == [0.2, 0.3]
+    assert coins[0].p_heads_after_heads == 0.5
+    assert coins[0].last_flip is None
+    assert coins[1].flip() in (0, 1)
+
+
+def test_markov_coin_invalid_probability():
+    with pytest.raises(ValueError):
+        MarkovCoin(p_heads_after_heads=1.5)
+
+
+def test_markov_coin_matches_stationary_bias():
+    coin = MarkovCoin(0.8, 0.4, rng=np.random.default_rng(seed=3))
+    flips = coin.flip_paths(2000, 200)
+    assert flips.shape == (2000, 200)
+    # 0.4 / (1 - 0.8 + 0.4) = 2/3
+    assert coin.stationary_bias == pytest.approx(2 / 3)
+    assert flips[:, 100:].mean() == pytest.approx(2 / 3, abs=0.01)
+
+
+def test_markov_coin_persistence():
+    """Sticky coins repeat their last flip more often than fair coins"""
+    coin = MarkovCoin(0.9, 0.1, rng=np.random.default_rng(seed=3))
+    flips = coin.flip_paths(500, 100)
+    repeats = np.mean(flips[:, 1:] == flips[:, :-1])
+    assert repeats == pytest.approx(0.9, abs=0.01)
+
+
+def test_paths_shape_and_steps(seeded_fair_coin):
+    walk = RandomWalk(seeded_fair_coin, npaths=20, start=3)
+    positions = walk.paths(15)
+    assert positions.shape == (20, 16)
+    assert all(positions[:, 0] == 3)
+    assert set(np.unique(np.diff(positions, axis=1))) <= {-1, 1}
+
+
+@pytest.mark.parametrize("npaths", [0, -5])
+def test_invalid_npaths(seeded_fair_coin, npaths):
+    with pytest.raises(ValueError):
+        RandomWalk(seeded_fair_coin, npaths=npaths)
+
+
+@pytest.mark.parametrize(
+    "lower, upper",
+    [
+        (0, None),  # lower barrier at start
+        (None, -1),  # upper barrier below start
+        (1.5, None),  # non-integer barrier
+    ],
+)
+def test_invalid_barriers(seeded_fair_coin, lower, upper):
+    walk = RandomWalk(seeded_fair_coin, npaths=10)
+    with pytest.raises((TypeError, ValueError)):
+        walk.run_until_absorbed(lower=lower, upper=upper)
+
+
+def test_gamblers_ruin_fair_coin(seeded_fair_coin):
+    """Starting at k between 0 and N: P(ruin) = 1 - k/N, E[T] = k(N - k)"""
+    walk = RandomWalk(seeded_fair_coin, npaths=20000, start=3)
+    result = walk.run_until_absorbed(lower=0, upper=10)
+    assert result.absorbed.all()
+    assert set(np.unique(result.final_positions)) == {0, 10}
+    assert result.absorption_probability(0) == pytest.approx(0.7, abs=0.015)
+    assert result.times.mean() == pytest.approx(21, rel=0.03)
+    assert result.hitting_time_distribution().sum() == pytest.approx(1)
+
+
+def test_absorption_matches_path_positions(seeded_fair_coin):
+    """Hitting times, maxima and barriers agree with the explicit paths"""
+    positions = RandomWalk(
+        Coin(0.5, rng=np.random.default_rng(seed=11)), npaths=200, start=2
+    ).paths(400)
+    result = RandomWalk(
+        Coin(0.5, rng=np.random.default_rng(seed=11)), npaths=200, start=2
+    ).run_until_absorbed(lower=0, upper=5, max_steps=400)
+
+    for path, time, final, maximum in zip(
+        positions, result.times, result.final_positions, result.maxima
+    ):
+        hits = np.flatnonzero((path <= 0) | (path >= 5))
+        if hits.size:
+            assert time == hits[0]
+            assert final == path[hits[0]]
+            assert maximum == path[: hits[0] + 1].max()
+        else:
+            assert time == -1
+
+
+def test_max_steps_leaves_paths_running():
+    coin = Coin(0.5, rng=np.random.default_rng(seed=5))
+    result = RandomWalk(coin, npaths=100).run_until_absorbed(
+        upper=1000, max_steps=10
+    )
+    assert not result.absorbed.any()
+    assert (np.abs(result.final_positions) <= 10).all()
+
+
+def test_first_passage_biased_coin():
+    """With P(+1) = p > 1/2, E[T_1] = 1 / (2p - 1)"""
+    coin = Coin(0.75, rng=np.random.default_rng(seed=2))
+    result = RandomWalk(coin, npaths=20000).run_until_absorbed(upper=1)
+    assert result.absorbed.all()
+    assert result.times.mean() == pytest.approx(2, rel=0.03)
+
+
+def test_markov_walk_is_absorbed():
+    coin = MarkovCoin(0.7, 0.3, rng=np.random.default_rng(seed=4))
+    result = RandomWalk(coin, npaths=5000, start=2).run_until_absorbed(
+        lower=0, upper=4
+    )
+    assert result.absorbed.all()
+    # symmetric chain: both barriers are equally likely
+    assert result.absorption_probability(4) == pytest.approx(0.5, abs=0.03)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin
+from probability_simulator.rng import (
+    BIT_GENERATORS,
+    CounterRNG,
+    RNGBackend,
+    benchmark_backends,
+    make_rng,
+    random_raw,
+)
+
+
+@pytest.mark.parametrize("backend", BIT_GENERATORS)
+def test_make_rng_is_seeded_backend(backend):
+    rng = make_rng(backend, seed=3)
+    assert isinstance(rng.bit_generator, BIT_GENERATORS[backend])
+    assert isinstance(rng, RNGBackend)
+    assert np.array_equal(rng.random(10), make_rng(backend, seed=3).random(10))
+
+
+@pytest.mark.parametrize("backend", BIT_GENERATORS)
+def test_batched_random_fills_buffer(backend):
+    buffer = np.zeros(1000)
+    make_rng(backend, seed=1).random(out=buffer)
+    assert np.array_equal(buffer, make_rng(backend, seed=1).random(1000))
+    assert ((buffer >= 0) & (buffer < 1)).all()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        make_rng("not-a-generator")
+
+
+def test_random_raw():
+    raw = random_raw(make_rng("sfc64", seed=2), 5)
+    assert raw.dtype == np.uint64
+    assert raw.shape == (5,)
+
+
+def test_random_raw_needs_raw_bits():
+    class UniformsOnly:
+        def random(self, size=None, dtype=np.float64, out=None):
+            return 0.5
+
+    assert not isinstance(UniformsOnly(), RNGBackend)
+    Coin(0.5, rng=UniformsOnly())  # coins only need random()
+    with pytest.raises(TypeError):
+        random_raw(UniformsOnly(), 5)
+
+
+def test_coin_accepts_backend_name():
+    coin = Coin(0.5, rng="philox")
+    assert isinstance(coin.rng.bit_generator, np.random.Philox)
+
+
+@pytest.mark.parametrize("position", [0, 1, 3, 4, 5, 17, 1000])
+def test_counter_rng_jumps_to_any_position(position):
+    counter_rng = CounterRNG(seed=11)
+    sequential = counter_rng.generator(stream=2).random(position + 10)
+    jumped = counter_rng.generator(stream=2, position=position).random(10)
+    assert np.array_equal(jumped, sequential[position:])
+
+
+def test_counter_rng_seek_reuses_generator():
+    counter_rng = CounterRNG(seed=11)
+    rng = counter_rng.generator()
+    rng.random(7)
+    counter_rng.seek(rng, stream=5, position=3)
+    expected = counter_rng.generator(stream=5).random(13)[3:]
+    assert np.array_equal(rng.random(10), expected)
+
+
+def test_counter_rng_seek_unchecked_after_other_seeks():
+    counter_rng = CounterRNG(seed=11)
+    rng = counter_rng.generator(stream=3, position=6)
+    rng.random(5)
+    counter_rng.seek_unchecked(rng, 9)
+    assert np.array_equal(
+        rng.random(10), counter_rng.generator(stream=9).random(10)
+    )
+    # generators made by generator() aren't tied to the last seek
+    other = counter_rng.generator(stream=1)
+    counter_rng.seek_unchecked(rng, 2, 5)
+    assert np.array_equal(
+        other.random(3), counter_rng.generator(stream=1).random(3)
+    )
+
+
+def test_counter_rng_streams_differ():
+    counter_rng = CounterRNG(seed=1)
+    first = counter_rng.generator(stream=0).random(100)
+    second = counter_rng.generator(stream=1).random(100)
+    assert not np.array_equal(first, second)
+
+
+def test_counter_rng_is_reproducible_from_seed():
+    original = CounterRNG()
+    replay = CounterRNG(seed=original.seed)
+    assert np.array_equal(
+        original.generator(3, 9).random(5), replay.generator(3, 9).random(5)
+    )
+
+
+@pytest.mark.parametrize("stream, position", [(-1, 0), (0, -1)])
+def test_counter_rng_rejects_negative_indices(stream, position):
+    with pytest.raises(ValueError):
+        CounterRNG(seed=1).generator(stream, position)
+
+
+def test_benchmark_backends():
+    throughput = benchmark_backends(n=10_000, repeat=1)
+    assert set(throughput) == set(BIT_GENERATORS)
+    assert all(
+        draws_per_second > 0 for draws_per_second in throughput.values()
+    )
@@ -0,0 +1,184 @@
+"""Each vectorized engine must match its scalar reference path in
+distribution. Both paths are run on independent seeded streams and
+compared with two-sample tests at a significance level of 0.001."""
+
+import math
+
+import numpy as np
+import pytest
+from probability_simulator.coin_flips import Coin, CoinExperiment
+from probability_simulator.engines import SAMPLERS, reference_trial
+from probability_simulator.games import MultiCoinExperiment, penney_tournament
+from probability_simulator.random_walks import MarkovCoin, RandomWalk
+
+# critical value of the two-sample KS test, and z of the chi-square test
+KS_CRITICAL = math.sqrt(-math.log(0.001 / 2) / 2)
+Z_CRITICAL = 3.09
+
+
+def assert_same_distribution(sample, reference):
+    """Two-sample Kolmogorov-Smirnov test of two samples of numbers"""
+    sample, reference = np.sort(sample), np.sort(reference)
+    values = np.union1d(sample, reference)
+    distance = np.abs(
+        np.searchsorted(sample, values, side="right") / sample.size
+        - np.searchsorted(reference, values, side="right") / reference.size
+    ).max()
+    n, m = sample.size, reference.size
+    assert distance < KS_CRITICAL * math.sqrt((n + m) / (n * m))
+
+
+def assert_same_frequencies(sample, reference):
+    """Chi-square test of homogeneity of two samples of categories"""
+    categories = np.union1d(sample, reference)
+    counts = np.array(
+        [
+            [(values == category).sum() for category in categories]
+            for values in (sample, reference)
+        ]
+    )
+    expected = (
+        counts.sum(axis=1, keepdims=True)
+        * counts.sum(axis=0, keepdims=True)
+        / counts.sum()
+    )
+    statistic = ((counts - expected) ** 2 / expected).sum()
+    # Wilson-Hilferty approximation of the chi-square critical value
+    dof = categories.size - 1
+    if dof == 0:
+        return
+    spread = 2 / (9 * dof)
+    critical = dof * (1 - spread + Z_CRITICAL * math.sqrt(spread)) ** 3
+    assert statistic < critical
+
+
+def seeded(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed=seed)
+
+
+def scalar_walk(coin, start, lower, upper):
+    """Hitting time and barrier of one walk, flip by flip"""
+    position, time = start, 0
+    while lower < position < upper:
+        position += 2 * coin.flip() - 1
+        time += 1
+    return time, position
+
+
+def scalar_game(coins, goals):
+    """Winner (-1 for a tie) and length of one game, round by round.
+
+    goals[i](flips) tells whether player i has met their goal given their
+    flips so far.
+    """
+    flips = [[] for _ in coins]
+    while True:
+        for coin, history in zip(coins, flips):
+            history.append(coin.flip())
+        met = [i for i, goal in enumerate(goals) if goal(flips[i])]
+        if met:
+            return (met[0] if len(met) == 1 else -1), len(flips[0])
+
+
+def ends_with(pattern):
+    target = [int(flip == "H") for flip in pattern]
+    return lambda history: history[-len(target) :] == target
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+@pytest.mark.parametrize(
+    "coin_factory",
+    [
+        lambda rng: Coin(0.2, rng=rng),
+        lambda rng: Coin(0.5, rng=rng),
+        lambda rng: Coin(0.9, rng=rng),
+        lambda rng: MarkovCoin(0.5, 0.05, bias=0.5, rng=rng),
+    ],
+)
+def test_samplers_match_scalar_trials(name, coin_factory):
+    ntrials = 10_000
+    fast = SAMPLERS[name](coin_factory(seeded(1)), ntrials)
+    # keyed trials each start from the coin's initial state
+    experiment = CoinExperiment.create_keyed_experiment(
+        coin_factory(None), ntrials, seed=2
+    )
+    reference = experiment.run_trials(reference_trial(name))
+    assert_same_distribution(fast, reference)
+
+
+@pytest.mark.parametrize(
+    "coin_factory",
+    [
+        lambda rng: Coin(0.45, rng=rng),
+        lambda rng: MarkovCoin(0.7, 0.4, bias=0.5, rng=rng),
+    ],
+)
+def test_random_walk_matches_scalar_walks(coin_factory):
+    npaths, start, lower, upper = 5000, 0, -4, 6
+    result = RandomWalk(coin_factory(seeded(3)), npaths, start)
+    result = result.run_until_absorbed(lower, upper)
+    # keyed trials each start from the coin's initial state
+    experiment = CoinExperiment.create_keyed_experiment(
+        coin_factory(None), npaths, seed=4
+    )
+    times, positions = experiment.run_trials(
+        lambda coin: scalar_walk(coin, start, lower, upper)
+    ).T
+    assert result.absorbed.all()
+    assert_same_distribution(result.times, times)
+    assert_same_frequencies(result.final_positions, positions)
+
+
+def test_race_matches_scalar_games():
+    ntrials, target = 5000, 2
+    biases = [0.3, 0.4, 0.5]
+    coins = [Coin(bias, rng=seeded(5)) for bias in biases]
+    result = MultiCoinExperiment(coins, ntrials).race(target)
+    rng = seeded(6)
+    coins = [Coin(bias, rng=rng) for bias in biases]
+    goals = [lambda history: sum(history) >= target] * len(coins)
+    winners, times = np.array(
+        [scalar_game(coins, goals) for _ in range(ntrials)]
+    ).T
+    assert_same_frequencies(result.winners, winners)
+    assert_same_distribution(result.times, times)
+
+
+def test_pattern_race_matches_scalar_games():
+    ntrials, patterns = 5000, ["HHT", "THT"]
+    coins = [Coin(0.6, rng=seeded(7)), Coin(0.5)]
+    result = MultiCoinExperiment(coins, ntrials).pattern_race(patterns)
+    coins = [Coin(0.6, rng=seeded(8)), Coin(0.5, rng=seeded(9))]
+    goals = [ends_with(pattern) for pattern in patterns]
+    winners, times = np.array(
+        [scalar_game(coins, goals) for _ in range(ntrials)]
+    ).T
+    assert_same_frequencies(result.winners, winners)
+    assert_same_distribution(result.times, times)
+
+
+def test_penney_tournament_matches_scalar_games():
+    ntrials, patterns = 5000, ["HTT", "TTH", "HT"]
+    tournament = penney_tournament(
+        Coin(0.5, rng=seeded(10)), patterns, ntrials
+    )
+    coin = Coin(0.5, rng=seeded(11))
+    goals = [ends_with(pattern) for pattern in patterns]
+    reference = []
+    for _ in range(ntrials):
+        # all players watch the same coin
+        history = []
+        first = [-1] * len(patterns)
+        while -1 in first:
+            history.append(coin.flip())
+            for i, goal in enumerate(goals):
+                if first[i] == -1 and goal(history):
+                    first[i] = len(history)
+        reference.append(first)
+    reference = np.array(reference)
+    for j in range(len(patterns)):
+        assert_same_distribution(tournament.times[:, j], reference[:, j])
+    # HTT against TTH
+    winner = np.sign(tournament.times[:, 0] - tournament.times[:, 1])
+    reference_winner = np.sign(reference[:, 0] - reference[:, 1])
+    assert_same_frequencies(winner, reference_winner)
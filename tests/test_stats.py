@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+import pytest
+from probability_simulator.stats import IntegerHistogram, RunningStats
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(seed=3).normal(5, 2, size=1000)
+
+
+def test_from_values_matches_numpy(values):
+    stats = RunningStats.from_values(values)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert stats.stderr == pytest.approx(values.std(ddof=1) / math.sqrt(1000))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_update_in_chunks_matches_single_pass(values):
+    stats = RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    expected = RunningStats.from_values(values)
+    assert stats.count == expected.count
+    assert stats.mean == pytest.approx(expected.mean)
+    assert stats.variance == pytest.approx(expected.variance)
+
+
+def test_merge_is_associative(values):
+    a, b, c = (RunningStats.from_values(x) for x in np.array_split(values, 3))
+    left = a.merge(b).merge(c)
+    right = a.merge(b.merge(c))
+    assert left.mean == pytest.approx(right.mean)
+    assert left.variance == pytest.approx(right.variance)
+
+
+def test_merge_with_empty_stats(values):
+    stats = RunningStats.from_values(values)
+    assert RunningStats().merge(stats) == stats
+    assert stats.merge(RunningStats()) == stats
+
+
+def test_empty_stats():
+    stats = RunningStats.from_values([])
+    assert stats.count == 0
+    assert math.isnan(stats.variance)
+    assert math.isnan(stats.stderr)
+
+
+# ----------------------------
+# IntegerHistogram
+# ----------------------------
+
+
+@pytest.fixture
+def integers():
+    return np.random.default_rng(seed=4).geometric(0.01, size=10_000)
+
+
+def test_histogram_matches_unique_counts(integers):
+    histogram = IntegerHistogram()
+    histogram.update(integers)
+    values, counts = histogram.values_and_counts()
+    expected_values, expected_counts = np.unique(integers, return_counts=True)
+    assert np.array_equal(values, expected_values)
+    assert np.array_equal(counts, expected_counts)
+    assert histogram.count == integers.size
+    assert histogram.mean == pytest.approx(integers.mean())
+
+
+def test_histogram_updates_in_chunks(integers):
+    whole, chunked = IntegerHistogram(), IntegerHistogram()
+    whole.update(integers)
+    for chunk in np.array_split(integers, 13):
+        chunked.update(chunk)
+    assert whole == chunked
+
+
+def test_histogram_keeps_tail_sparse(integers):
+    """Values beyond max_dense_bins don't grow the dense array"""
+    histogram = IntegerHistogram(max_dense_bins=64)
+    histogram.update(integers)
+    histogram.update([10**12, -5])
+    assert histogram._dense.size == 64
+    values, counts = histogram.values_and_counts()
+    assert values[0] == -5 and values[-1] == 10**12
+    assert counts.sum() == integers.size + 2
+
+
+def test_histogram_dense_array_grows_on_demand():
+    histogram = IntegerHistogram()
+    histogram.update([3])
+    assert histogram._dense.size == 4
+    histogram.update([5])
+    assert histogram._dense.size == 8
+
+
+def test_histogram_merge(integers):
+    halves = np.array_split(integers, 2)
+    whole, left, right = (
+        IntegerHistogram(),
+        IntegerHistogram(),
+        IntegerHistogram(8),
+    )
+    whole.update(integers)
+    left.update(halves[0])
+    right.update(halves[1])
+    assert left.merge(right) == whole
+    assert left.merge(right).count == integers.size
+
+
+def test_histogram_pmf_sums_to_one(integers):
+    histogram = IntegerHistogram(max_dense_bins=100)
+    histogram.update(integers)
+    values, probabilities = histogram.pmf()
+    assert probabilities.sum() == pytest.approx(1)
+    assert np.array_equal(
+        histogram.dense_counts(300), np.bincount(integers, minlength=300)[:300]
+    )
+
+
+def test_histogram_rejects_floats():
+    with pytest.raises(TypeError):
+        IntegerHistogram().update(np.array([1.5]))
+
+
+def test_histogram_counts_booleans():
+    histogram = IntegerHistogram()
+    histogram.update(np.array([True, False, True]))
+    assert histogram.dense_counts(2).tolist() == [1, 2]
@@ -0,0 +1,99 @@
+"""Tests on switching validation off with validation.disabled()"""
+
+import asyncio
+import threading
+
+import pytest
+from probability_simulator import validation
+from probability_simulator.coin_flips import Coin
+from probability_simulator.validation import Field, RealNumberWithinInterval
+
+
+class Example:
+    x = RealNumberWithinInterval("[0,1]")
+
+
+def test_validation_is_enabled_by_default():
+    assert validation.is_enabled()
+
+
+def test_disabled_skips_validation():
+    e = Example()
+    with validation.disabled():
+        assert not validation.is_enabled()
+        e.x = 5
+    assert e.x == 5
+
+
+def test_disabled_skips_preprocessing():
+    e = Example()
+    with validation.disabled():
+        e.x = "0.5"
+    assert e.x == "0.5"
+
+
+def test_validation_restored_after_block():
+    with validation.disabled():
+        pass
+    assert validation.is_enabled()
+    with pytest.raises(ValueError):
+        Example().x = 5
+
+
+def test_validation_restored_after_exception():
+    with pytest.raises(RuntimeError):
+        with validation.disabled():
+            raise RuntimeError
+    assert validation.is_enabled()
+
+
+def test_disabled_blocks_nest():
+    with validation.disabled():
+        with validation.disabled():
+            pass
+        assert not validation.is_enabled()
+    assert validation.is_enabled()
+
+
+def test_other_threads_keep_validating():
+    errors = []
+
+    def assign_invalid():
+        try:
+            Example().x = 5
+        except ValueError as error:
+            errors.append(error)
+
+    with validation.disabled():
+        thread = threading.Thread(target=assign_invalid)
+        thread.start()
+        thread.join()
+    assert len(errors) == 1
+
+
+def test_other_tasks_keep_validating():
+    async def is_enabled_in_task():
+        return validation.is_enabled()
+
+    async def main():
+        task = asyncio.create_task(is_enabled_in_task())
+        with validation.disabled():
+            inside = await is_enabled_in_task()
+        return inside, await task
+
+    assert asyncio.run(main()) == (False, True)
+
+
+def test_set_unchecked():
+    e = Example()
+    Example.x.set_unchecked(e, 0.25)
+    assert e.x == 0.25
+    assert isinstance(Example.x, Field)
+
+
+def test_coin_bias_sweep_without_validation():
+    coin = Coin(0.5)
+    for bias in (0.1, 0.2, 0.3):
+        with validation.disabled():
+            coin.bias = bias
+        assert coin.bias == bias
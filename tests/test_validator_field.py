@@ -1,5 +1,6 @@
 import pytest
 import math
+import numpy as np
 from numbers import Real
 from probability_simulator.validation import RealNumber, Field
 
@@ -167,3 +168,97 @@ def test_realnumber_preprocessing_no_autoconvert(
         e.x = input_str
         assert e.x == expected
         assert isinstance(e.x, Real)
+
+
+# ------------------------------
+# Bulk validation Tests
+# ------------------------------
+
+
+def test_field_validate_many_returns_values():
+    class Example:
+        x = Field(expected_type=int)
+
+    assert Example.x.validate_many([1, 2, 3]) == [1, 2, 3]
+
+
+def test_field_validate_many_reports_every_failure():
+    class Example:
+        x = Field(expected_type=int)
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        Example.x.validate_many([1, "a", 2, None])
+
+    errors = excinfo.value.exceptions
+    assert len(errors) == 2
+    assert all(isinstance(error, TypeError) for error in errors)
+    assert errors[0].__notes__ == ["x[1] = 'a'"]
+    assert errors[1].__notes__ == ["x[3] = None"]
+
+
+def test_field_set_many():
+    class Example:
+        x = Field(expected_type=int)
+
+    instances = [Example() for _ in range(3)]
+    Example.x.set_many(instances, [4, 5, 6])
+    assert [e.x for e in instances] == [4, 5, 6]
+
+
+def test_field_set_many_length_mismatch():
+    class Example:
+        x = Field(expected_type=int)
+
+    with pytest.raises(ValueError):
+        Example.x.set_many([Example()], [1, 2])
+
+
+def test_field_set_many_sets_nothing_on_failure():
+    class Example:
+        x = Field(expected_type=int)
+
+    instances = [Example(), Example()]
+    with pytest.raises(ExceptionGroup):
+        Example.x.set_many(instances, [1, "b"])
+    assert all("x" not in e.__dict__ for e in instances)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (np.array([1, 2, 3]), [1, 2, 3]),
+        (np.array([0.5, -1.5]), [0.5, -1.5]),
+        (["1.5", 2, " 3 "], [1.5, 2, 3.0]),  # per-item preprocessing
+    ],
+)
+def test_realnumber_validate_many(values, expected):
+    class Example:
+        x = RealNumber()
+
+    result = Example.x.validate_many(values)
+    assert result == expected
+    assert all(isinstance(value, Real) for value in result)
+
+
+def test_realnumber_validate_many_reports_bad_strings():
+    class Example:
+        x = RealNumber()
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        Example.x.validate_many(["1", "abc", 2, "def"])
+    assert len(excinfo.value.exceptions) == 2
+
+
+@pytest.mark.parametrize("values", [[1, 2], np.array([1.0, 2.0])])
+def test_realnumber_set_many_runs_preprocessors(values):
+    """Bulk assignment stores the same values as __set__"""
+
+    class Example:
+        x = RealNumber(preprocessors=[lambda value, name: value * 2])
+
+    single = Example()
+    single.x = 1
+    instances = [Example(), Example()]
+    Example.x.set_many(instances, values)
+    assert single.x == 2
+    assert [e.x for e in instances] == [2, 4]
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from probability_simulator.validation import RealNumberWithinInterval
 
@@ -133,3 +134,59 @@ def test_real_value_within_interval_boundaries(
     else:
         with pytest.raises(ValueError):
             e.x = boundary_value
+
+
+# ----------------------------
+# Test bulk validation
+# ----------------------------
+
+
+@pytest.mark.parametrize(
+    "interval_str, values, invalid_indices",
+    [
+        ("[0,1]", np.linspace(0, 1, 11), []),
+        ("[0,1]", np.array([-0.1, 0.5, 1.1]), [0, 2]),
+        ("(0,1)", np.array([0, 0.5, 1]), [0, 2]),
+        ("[0,1)", np.array([0, 1]), [1]),
+        ("(-inf, 0]", np.array([-1e10, 0, 1]), [2]),
+        ("[0,1]", [0.2, "0.4", 5], [2]),  # mixed types use the slow path
+    ],
+)
+def test_real_value_within_interval_validate_many(
+    interval_str, values, invalid_indices
+):
+    class Example:
+        x = RealNumberWithinInterval(interval_str)
+
+    if not invalid_indices:
+        assert Example.x.validate_many(values) == list(values)
+        return
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        Example.x.validate_many(values)
+    errors = excinfo.value.exceptions
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert [error.__notes__[0].split("]")[0] for error in errors] == [
+        f"x[{index}" for index in invalid_indices
+    ]
+
+
+def test_validate_many_matches_scalar_validation():
+    """The vectorized path accepts exactly what __set__ accepts"""
+
+    class Example:
+        x = RealNumberWithinInterval("(0,1]")
+
+    values = np.array([-1, 0, 1e-12, 0.5, 1, 1 + 1e-12, np.inf, -np.inf])
+    accepted = []
+    for value in values.tolist():
+        try:
+            Example().x = value
+            accepted.append(value)
+        except ValueError:
+            pass
+
+    with pytest.raises(ExceptionGroup) as excinfo:
+        Example.x.validate_many(values)
+    rejected = [error.__notes__[0] for error in excinfo.value.exceptions]
+    assert len(accepted) + len(rejected) == len(values)